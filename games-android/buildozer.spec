@@ -14,12 +14,16 @@ source.dir = .
 
 # Main Python file
 source.include_exts = py,png,jpg,kv,atlas
+source.exclude_patterns = p4a_hook.py
+
+# Copies the shared simulation core from ../games-python into the APK
+p4a.hook = p4a_hook.py
 
 # App version
 version = 1.0
 
 # App requirements
-requirements = python3,kivy
+requirements = python3,kivy,numpy
 
 # Android specific configurations
 android.permissions = INTERNET
@@ -1,17 +1,38 @@
+"""Kivy frontend for Zombie Shooter (the Android build).
+
+The game itself is zombie_engine.Simulation, the same headless core the pygame
+frontend in games-python runs. From a checkout it is imported from there; the
+APK build copies its modules next to this file (see p4a_hook.py). This file
+only turns touches into an InputState per tick and draws the simulation's
+entity stores with a handful of batched meshes.
+"""
 from kivy.app import App
 from kivy.uix.widget import Widget
 from kivy.core.window import Window
 from kivy.clock import Clock
-from kivy.graphics import Color, Ellipse, Rectangle
-from kivy.vector import Vector
-from kivy.core.text import Label as CoreLabel
-import random
+from kivy.graphics import Color, Mesh, PushMatrix, PopMatrix, Translate, Scale
+from kivy.graphics.texture import Texture
+from array import array
 import math
-import json
+import os
+import sys
+
+import numpy as np
+
+# The shared core, when running from a checkout; in the APK it sits next to this file
+CORE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'games-python')
+if os.path.isdir(CORE_DIR):
+    sys.path.insert(0, CORE_DIR)
+
+from zombie_engine import SCREEN_WIDTH, SCREEN_HEIGHT, FPS, TICK_MS, InputState, Simulation
+from timestep import FixedStep
+from orbs import ORB_SIZE
+from horde import NORMAL, BUFF, GREEN as GREEN_ZOMBIE, BLACK as BLACK_ZOMBIE
+from projectiles import BULLET, RED_BULLET, SMALL_BULLET, BOSS_BULLET, FINAL_BOSS_BULLET, KIND_LAYER
 
 # Constants
-SCREEN_WIDTH = 800
-SCREEN_HEIGHT = 600
+JOYSTICK_DEAD_ZONE = 50  # Touches closer than this to a stick's centre don't move or aim
+STICK_DIAGONAL = 0.38  # sin(22.5 degrees): a stick axis counts as pressed past this share of the offset
 
 # Colors
 BLACK = (0, 0, 0, 1)
@@ -24,243 +45,391 @@ GRAY = (0.5, 0.5, 0.5, 1)
 ORANGE = (1, 0.65, 0, 1)
 DARK_RED = (0.59, 0, 0, 1)
 GOLD = (1, 0.84, 0, 1)
-
-class Orb:
-    def __init__(self, x, y):
-        self.pos = Vector(x, y)
-        self.size = 5
-        self.collected = False
-        self.collection_range = 20
-        self.magnet_range = 80
-        self.magnet_speed = 6
-
-    def update(self, player_pos):
-        direction = Vector(player_pos) - self.pos
-        distance = direction.length()
-
-        if distance < self.collection_range:
-            self.collected = True
-            return True
-        elif distance < self.magnet_range:
-            if distance > 0:
-                direction = direction.normalize() * self.magnet_speed
-                self.pos += direction
-        return False
-
-class Player:
-    def __init__(self, x, y):
-        self.pos = Vector(x, y)
-        self.size = 20
-        self.speed = 5
-        self.last_shot = 0
-        self.base_shoot_delay = 200
-        self.shoot_delay = 200
-        self.health = 10
-        self.max_health = 10
-        self.last_damage_time = 0
-        self.damage_cooldown = 1000
-        self.touch_pos = Vector(0, 0)
-        self.joystick_pos = Vector(0, 0)
-        self.is_moving = False
-
-    def update_shoot_speed(self, level):
-        speed_multiplier = 2 ** (level - 1)
-        self.shoot_delay = max(25, self.base_shoot_delay // speed_multiplier)
-
-class Bullet:
-    def __init__(self, x, y, dx, dy, damage=1, is_red=False):
-        self.pos = Vector(x, y)
-        self.velocity = Vector(dx, dy)
-        self.size = 3
-        self.damage = damage
-        self.is_red = is_red
-
-    def update(self):
-        self.pos += self.velocity
-
-    def is_off_screen(self):
-        return (self.pos.x < 0 or self.pos.x > Window.width or 
-                self.pos.y < 0 or self.pos.y > Window.height)
-
-class Zombie:
-    def __init__(self, x, y, is_buff=False, is_green=False, is_black=False):
-        self.pos = Vector(x, y)
-        self.is_buff = is_buff
-        self.is_green = is_green
-        self.is_black = is_black
-        self.last_shot = 0
-        self.shoot_delay = 4000
-
-        if is_black:
-            self.size = 35
-            self.speed = 1.2
-            self.health = 560
-            self.max_health = 560
-        elif is_green:
-            self.size = 7
-            self.speed = 2.0
-            self.health = 112
-            self.max_health = 112
-        elif is_buff:
-            self.size = 45
-            self.speed = 1.0
-            self.health = 16
-            self.max_health = 16
+DARK_GREEN = (0, 0.59, 0, 1)
+
+# Zombie kind -> body colour and health bar (width, height), as in the pygame frontend
+ZOMBIE_COLORS = {NORMAL: RED, BUFF: ORANGE, GREEN_ZOMBIE: GREEN, BLACK_ZOMBIE: BLACK}
+ZOMBIE_BAR_SIZE = np.array([(20, 4), (30, 6), (40, 8), (50, 8)], dtype=np.float64)
+
+# Projectile kind -> colour, and the glow around the boss bullets as (colour, extra radius)
+BULLET_COLORS = {BULLET: YELLOW, RED_BULLET: RED, SMALL_BULLET: RED, BOSS_BULLET: RED, FINAL_BOSS_BULLET: GOLD}
+BULLET_GLOWS = {BOSS_BULLET: (RED, 8), FINAL_BOSS_BULLET: (GOLD, 3)}
+
+def make_texture(alpha):
+    """A white RGBA texture with the given (size, size) alpha array, tinted per batch by its Color"""
+    size = alpha.shape[0]
+    pixels = np.full((size, size, 4), 255, dtype=np.uint8)
+    pixels[:, :, 3] = np.clip(alpha * 255, 0, 255)
+    texture = Texture.create(size=(size, size), colorfmt='rgba')
+    texture.blit_buffer(pixels.tobytes(), colorfmt='rgba', bufferfmt='ubyte')
+    return texture
+
+def disc_alpha(size=64):
+    """A solid disc with a one-pixel soft edge"""
+    center = (size - 1) / 2
+    y, x = np.mgrid[:size, :size]
+    distance = np.hypot(x - center, y - center)
+    return size / 2 - distance
+
+def glow_alpha(size=64):
+    """A disc fading out from the middle to its edge"""
+    center = (size - 1) / 2
+    y, x = np.mgrid[:size, :size]
+    distance = np.hypot(x - center, y - center)
+    return (1 - distance / (size / 2)) * 0.6
+
+class SpriteBatch:
+    """One Color and one Mesh drawing a quad per sprite, so a whole layer is a single draw call.
+
+    The vertex buffer is an array('f') allocated up front with the texture coordinates
+    already in it, and viewed from NumPy as (quad, corner, x y u v). Each frame discs() or
+    rects() writes the corner positions of every quad in a few array assignments, collapses
+    the quads left over from a busier frame and hands the buffer to the Mesh. The buffer is
+    reallocated at double the size when a frame needs more quads than it holds.
+    """
+    MAX_QUADS = 16384  # Four vertices a quad and 16-bit indices
+    # Per vertex: x, y, u, v
+    QUAD = (0.0, 0.0, 0.0, 0.0,  0.0, 0.0, 1.0, 0.0,  0.0, 0.0, 1.0, 1.0,  0.0, 0.0, 0.0, 1.0)
+
+    def __init__(self, canvas, color, texture=None, capacity=64):
+        self.color = Color(*color)
+        self.mesh = Mesh(mode='triangles', texture=texture)
+        canvas.add(self.color)
+        canvas.add(self.mesh)
+        self.used = 0  # Quads written last frame
+        self.allocate(capacity)
+
+    def allocate(self, capacity):
+        capacity = min(capacity, self.MAX_QUADS)
+        self.vertices = array('f', self.QUAD) * capacity
+        self.quads = np.frombuffer(self.vertices, dtype=np.float32).reshape(capacity, 4, 4)
+        self.capacity = capacity
+        self.used = 0
+        indices = []
+        for base in range(0, capacity * 4, 4):
+            indices += (base, base + 1, base + 2, base + 2, base + 3, base)
+        self.mesh.indices = indices
+
+    def rects(self, left, top, width, height):
+        """One quad per element of the arrays (or scalars) of world-space boxes"""
+        left, top, width, height = np.broadcast_arrays(*np.atleast_1d(left, top, width, height))
+        count = min(len(left), self.MAX_QUADS)
+        if count == 0 and self.used == 0:
+            return
+        if count > self.capacity:
+            capacity = self.capacity
+            while capacity < count:
+                capacity *= 2
+            self.allocate(capacity)
+        quads = self.quads
+        right = left[:count] + width[:count]
+        bottom = top[:count] + height[:count]
+        quads[:count, 0, 0] = quads[:count, 3, 0] = left[:count]
+        quads[:count, 1, 0] = quads[:count, 2, 0] = right
+        quads[:count, 0, 1] = quads[:count, 1, 1] = top[:count]
+        quads[:count, 2, 1] = quads[:count, 3, 1] = bottom
+        # Quads past this frame's count are collapsed onto one point and draw nothing
+        quads[count:self.used, :, :2] = 0
+        self.used = count
+        self.mesh.vertices = self.vertices
+
+    def discs(self, x, y, radius):
+        """A disc (or square, untextured) of the given radius centred on each (x, y)"""
+        x, y, radius = np.broadcast_arrays(*np.atleast_1d(x, y, radius))
+        self.rects(x - radius, y - radius, radius * 2, radius * 2)
+
+class EntityRenderer:
+    """Retained-mode drawing for GameWidget: a fixed set of SpriteBatches added to the canvas
+    once and refilled in place every frame from the simulation's entity stores. The number
+    of draw calls is the number of batches, however many entities are alive.
+
+    Batches are drawn in simulation coordinates; GameWidget's canvas transform maps them
+    onto the window.
+    """
+    def __init__(self, canvas):
+        disc = make_texture(disc_alpha())
+        glow = make_texture(glow_alpha())
+        # Added in draw order, back to front, as the pygame frontend draws
+        self.player = SpriteBatch(canvas, WHITE, disc, capacity=1)
+        self.player_bar_back = SpriteBatch(canvas, BLACK, capacity=1)
+        self.player_bar = SpriteBatch(canvas, GREEN, capacity=1)
+        self.bullet_glows = {kind: SpriteBatch(canvas, color[:3] + (0.5,), glow)
+                             for kind, (color, _) in BULLET_GLOWS.items()}
+        self.bullets = {kind: SpriteBatch(canvas, color, disc, capacity=256)
+                        for kind, color in BULLET_COLORS.items()}
+        self.zombies = {kind: SpriteBatch(canvas, color, disc) for kind, color in ZOMBIE_COLORS.items()}
+        self.hurt_zombies = SpriteBatch(canvas, DARK_RED, disc)  # Normal zombies turn dark red once hurt
+        self.zombie_bar_backs = SpriteBatch(canvas, BLACK)
+        self.zombie_bars = SpriteBatch(canvas, GREEN)
+        self.orb_rings = SpriteBatch(canvas, DARK_GREEN, disc, capacity=256)
+        self.orbs = SpriteBatch(canvas, GREEN, disc, capacity=256)
+        self.boss_glow = SpriteBatch(canvas, DARK_RED, glow, capacity=1)
+        self.boss = SpriteBatch(canvas, BLACK, disc, capacity=1)
+        self.final_boss_aura = SpriteBatch(canvas, RED, glow, capacity=1)
+        self.final_boss = SpriteBatch(canvas, GOLD, disc, capacity=1)
+        # HUD: orb progress along the top, boss health along the bottom
+        self.orb_bar_back = SpriteBatch(canvas, GRAY, capacity=1)
+        self.orb_bar = SpriteBatch(canvas, GREEN, capacity=1)
+        self.boss_bar_back = SpriteBatch(canvas, GRAY, capacity=1)
+        self.boss_bar = SpriteBatch(canvas, RED, capacity=1)
+
+    def draw(self, sim, alpha):
+        """Refill every batch from the simulation, `alpha` of the way from the previous tick to this one"""
+        player = sim.player
+        x = player.prev_x + (player.x - player.prev_x) * alpha
+        y = player.prev_y + (player.y - player.prev_y) * alpha
+        self.player.discs(x, y, player.size)
+        bar_width = 40
+        bar_x = x - bar_width // 2
+        bar_y = y - player.size - 15
+        self.player_bar_back.rects(bar_x, bar_y, bar_width, 6)
+        self.player_bar.rects(bar_x, bar_y, max(0, player.health / player.max_health) * bar_width, 6)
+        if player.health > 6:
+            self.player_bar.color.rgba = GREEN
+        elif player.health > 3:
+            self.player_bar.color.rgba = ORANGE
         else:
-            self.size = 15
-            self.speed = 1.5
-            self.health = 2
-            self.max_health = 2
-
-    def update(self, player_pos):
-        direction = Vector(player_pos) - self.pos
-        if direction.length() > 0:
-            direction = direction.normalize() * self.speed
-            self.pos += direction
+            self.player_bar.color.rgba = RED
+
+        shots = {}
+        for layer, store in sim.shots.items():
+            n = len(store)
+            shots[layer] = (store.lerp('x', alpha), store.lerp('y', alpha), store.kind[:n], store.size[:n])
+        for kind, batch in self.bullets.items():
+            x, y, kinds, size = shots[KIND_LAYER[kind]]
+            mine = kinds == kind
+            if kind in self.bullet_glows:
+                self.bullet_glows[kind].discs(x[mine], y[mine], size[mine] + BULLET_GLOWS[kind][1])
+            batch.discs(x[mine], y[mine], size[mine])
+
+        zombies = sim.zombies
+        n = len(zombies)
+        x = zombies.lerp('x', alpha)
+        y = zombies.lerp('y', alpha)
+        kinds = zombies.kind[:n]
+        size = zombies.size[:n]
+        health = zombies.health[:n]
+        max_health = zombies.max_health[:n]
+        hurt = health < max_health
+        for kind, batch in self.zombies.items():
+            mine = kinds == kind
+            if kind == NORMAL:
+                self.hurt_zombies.discs(x[mine & hurt], y[mine & hurt], size[mine & hurt])
+                mine &= ~hurt
+            batch.discs(x[mine], y[mine], size[mine])
+        # Health bars over the damaged ones: background, then the green part cut to their health
+        bar_size = ZOMBIE_BAR_SIZE[kinds[hurt]]
+        bar_x = x[hurt] - bar_size[:, 0] // 2
+        bar_y = y[hurt] - size[hurt] - 10
+        self.zombie_bar_backs.rects(bar_x, bar_y, bar_size[:, 0], bar_size[:, 1])
+        self.zombie_bars.rects(bar_x, bar_y, bar_size[:, 0] * health[hurt] / max_health[hurt], bar_size[:, 1])
+
+        orbs = sim.orbs
+        x = orbs.lerp('x', alpha)
+        y = orbs.lerp('y', alpha)
+        self.orb_rings.discs(x, y, ORB_SIZE + 2)
+        self.orbs.discs(x, y, ORB_SIZE)
+
+        for boss, glow, body, extra in ((sim.boss, self.boss_glow, self.boss, 16),
+                                        (sim.final_boss, self.final_boss_aura, self.final_boss, 30)):
+            if boss:
+                x = boss.prev_x + (boss.x - boss.prev_x) * alpha
+                y = boss.prev_y + (boss.y - boss.prev_y) * alpha
+                glow.discs(x, y, boss.size + extra)
+                body.discs(x, y, boss.size)
+            else:
+                glow.discs((), (), ())
+                body.discs((), (), ())
+
+        self.orb_bar_back.rects(200, 10, 300, 15)
+        self.orb_bar.rects(200, 10, sim.orbs_collected / sim.orbs_needed * 300, 15)
+        boss = sim.active_boss()
+        if boss:
+            self.boss_bar_back.rects(20, SCREEN_HEIGHT - 60, SCREEN_WIDTH - 40, 25)
+            self.boss_bar.rects(20, SCREEN_HEIGHT - 60, max(0, boss.health / boss.max_health) * (SCREEN_WIDTH - 40), 25)
+            self.boss_bar.color.rgba = GOLD if sim.final_boss else RED
+        else:
+            self.boss_bar_back.rects((), (), (), ())
+            self.boss_bar.rects((), (), (), ())
 
 class GameWidget(Widget):
-    def __init__(self, **kwargs):
+    """Touch frontend: two on-screen sticks become an InputState, the Simulation does the rest"""
+    def __init__(self, update_rate=FPS, **kwargs):
         super().__init__(**kwargs)
-        self.player = Player(Window.width / 2, Window.height / 2)
-        self.bullets = []
-        self.zombies = []
-        self.orbs = []
-        self.score = 0
-        self.zombie_spawn_timer = 0
-        self.zombie_spawn_delay = 2000
-        self.zombies_spawned = 0
-        
-        self.orbs_collected = 0
-        self.level = 1
-        self.orbs_needed = 10
-        
-        self.green_spawn_count = 0
         self.paused = False
-        
-        # Touch controls
-        self.move_joystick = Vector(100, 100)  # Left side joystick
-        self.shoot_joystick = Vector(Window.width - 100, 100)  # Right side joystick
-        self.joystick_size = 50
-        self.active_touches = {}
-        
-        Clock.schedule_interval(self.update, 1.0 / 60.0)
+        self.suspended = False  # The app is in the background
+
+        # Touch controls: the left half of the screen moves, the right half aims and shoots
+        self.move_joystick = (100, 100)  # Left side joystick
+        self.shoot_joystick = (Window.width - 100, 100)  # Right side joystick
+        self.active_touches = {}  # touch.uid -> 'move' or 'shoot'
+        self.move_touch = None
+        self.shoot_touch = None
+
+        # The simulation is drawn in its own 800x600 space, flipped to y-down and scaled to fit
+        with self.canvas.before:
+            PushMatrix()
+            self.view_translate = Translate()
+            self.view_scale = Scale()
+        self.renderer = EntityRenderer(self.canvas)
+        with self.canvas.after:
+            PopMatrix()
+        self.bind(pos=self.fit_view, size=self.fit_view)
+        self.fit_view()
+
+        # The clock only runs while there is something to simulate: paused, game over and
+        # backgrounded games leave it cancelled, and the canvas is only redrawn when it changes
+        self.update_interval = 1.0 / update_rate
+        self.clock_event = Clock.schedule_interval(self.update, self.update_interval)
+        self.clock_event.cancel()
+        self.restarted_clock = False
+        self.timestep = FixedStep(TICK_MS)
+        self.new_game()
         self._keyboard = Window.request_keyboard(self._on_keyboard_closed, self)
         self._keyboard.bind(on_key_down=self._on_key_down)
         self._keyboard.bind(on_key_up=self._on_key_up)
 
+    def new_game(self):
+        self.sim = Simulation()
+        self.timestep.reset()
+        self.paused = False
+        self.draw_frame(1.0)
+        self.update_clock()
+
+    def fit_view(self, *args):
+        """Letterbox the simulation's screen into the widget"""
+        scale = min(self.width / SCREEN_WIDTH, self.height / SCREEN_HEIGHT)
+        self.view_scale.x = scale
+        self.view_scale.y = -scale
+        self.view_translate.x = self.x + (self.width - SCREEN_WIDTH * scale) / 2
+        self.view_translate.y = self.y + (self.height + SCREEN_HEIGHT * scale) / 2
+
+    def update_clock(self):
+        """Schedule or cancel the update clock to match the game state"""
+        running = not (self.paused or self.sim.game_over or self.suspended)
+        if running and not self.clock_event.is_triggered:
+            self.clock_event()
+            self.restarted_clock = True
+        elif not running:
+            self.clock_event.cancel()
+
+    def set_paused(self, paused):
+        self.paused = paused
+        self.update_clock()
+
+    def suspend(self):
+        """Freeze the game while the app is in the background"""
+        self.suspended = True
+        self.update_clock()
+
+    def resume(self):
+        self.suspended = False
+        self.update_clock()
+
     def on_touch_down(self, touch):
+        if self.sim.game_over:
+            # Tap to play again
+            self.new_game()
+            return True
         # Left side of screen controls movement
         if touch.x < Window.width / 2:
-            self.active_touches['move'] = touch
-            self.player.joystick_pos = Vector(touch.x, touch.y)
-            self.player.is_moving = True
+            self.active_touches[touch.uid] = 'move'
+            self.move_touch = touch.pos
         # Right side controls shooting
         else:
-            self.active_touches['shoot'] = touch
-            self.player.touch_pos = Vector(touch.x, touch.y)
+            self.active_touches[touch.uid] = 'shoot'
+            self.shoot_touch = touch.pos
+        return True
 
     def on_touch_move(self, touch):
         if touch.uid in self.active_touches:
             if self.active_touches[touch.uid] == 'move':
-                self.player.joystick_pos = Vector(touch.x, touch.y)
+                self.move_touch = touch.pos
             else:
-                self.player.touch_pos = Vector(touch.x, touch.y)
+                self.shoot_touch = touch.pos
 
     def on_touch_up(self, touch):
         if touch.uid in self.active_touches:
             if self.active_touches[touch.uid] == 'move':
-                self.player.is_moving = False
+                self.move_touch = None
+            else:
+                self.shoot_touch = None
             del self.active_touches[touch.uid]
 
+    def _on_key_down(self, keyboard, keycode, text, modifiers):
+        if keycode[1] == 'p' and not self.sim.game_over:
+            self.set_paused(not self.paused)
+        elif keycode[1] == 'r' and self.sim.game_over:
+            self.new_game()
+        return True
+
+    def _on_key_up(self, keyboard, keycode):
+        return True
+
     def _on_keyboard_closed(self):
         self._keyboard.unbind(on_key_down=self._on_key_down)
         self._keyboard.unbind(on_key_up=self._on_key_up)
         self._keyboard = None
 
+    def read_input(self):
+        """The sticks as this frame's InputState: eight-way movement, and an aim point off the
+        player in the direction the right stick is pushed (the player itself when it isn't,
+        which holds fire)"""
+        inputs = InputState()
+        if self.move_touch:
+            dx = self.move_touch[0] - self.move_joystick[0]
+            dy = self.move_touch[1] - self.move_joystick[1]
+            distance = math.sqrt(dx * dx + dy * dy)
+            if distance > JOYSTICK_DEAD_ZONE:
+                # Touch y points up, the simulation's down
+                inputs.right = dx > distance * STICK_DIAGONAL
+                inputs.left = dx < -distance * STICK_DIAGONAL
+                inputs.up = dy > distance * STICK_DIAGONAL
+                inputs.down = dy < -distance * STICK_DIAGONAL
+        player = self.sim.player
+        inputs.aim = (player.x, player.y)
+        if self.shoot_touch:
+            dx = self.shoot_touch[0] - self.shoot_joystick[0]
+            dy = self.shoot_touch[1] - self.shoot_joystick[1]
+            if dx * dx + dy * dy > JOYSTICK_DEAD_ZONE * JOYSTICK_DEAD_ZONE:
+                inputs.aim = (player.x + dx, player.y - dy)
+        return inputs
+
     def update(self, dt):
-        if self.paused:
+        if self.paused or self.sim.game_over:
             return
-
-        # Update player position based on touch input
-        if self.player.is_moving:
-            direction = Vector(self.player.joystick_pos) - Vector(self.move_joystick)
-            if direction.length() > self.joystick_size:
-                direction = direction.normalize() * self.player.speed
-                self.player.pos += direction
-
-        # Spawn zombies
-        self.zombie_spawn_timer += dt * 1000
-        if self.zombie_spawn_timer > self.zombie_spawn_delay:
-            self.spawn_zombie()
-            self.zombie_spawn_timer = 0
-
-        # Update game objects
-        for bullet in self.bullets[:]:
-            bullet.update()
-            if bullet.is_off_screen():
-                self.bullets.remove(bullet)
-
-        for zombie in self.zombies:
-            zombie.update(self.player.pos)
-
-        for orb in self.orbs[:]:
-            if orb.update(self.player.pos):
-                self.orbs.remove(orb)
-                self.orbs_collected += 1
-                self.check_level_up()
-
-        self.check_collisions()
-
-    def spawn_zombie(self):
-        side = random.randint(0, 3)
-        if side == 0:  # Top
-            x = random.randint(0, Window.width)
-            y = -20
-        elif side == 1:  # Right
-            x = Window.width + 20
-            y = random.randint(0, Window.height)
-        elif side == 2:  # Bottom
-            x = random.randint(0, Window.width)
-            y = Window.height + 20
-        else:  # Left
-            x = -20
-            y = random.randint(0, Window.height)
-
-        if self.level >= 10:
-            self.green_spawn_count += 1
-            if self.green_spawn_count % 20 == 0:
-                self.zombies.append(Zombie(x, y, is_black=True))
-            else:
-                self.zombies.append(Zombie(x, y, is_green=True))
-        elif self.level >= 5:
-            if (self.zombies_spawned + 1) % 15 == 0:
-                self.zombies.append(Zombie(x, y, is_green=True))
-            else:
-                self.zombies.append(Zombie(x, y, is_buff=True))
-        else:
-            is_buff = (self.zombies_spawned + 1) % 5 == 0
-            self.zombies.append(Zombie(x, y, is_buff=is_buff))
-
-        self.zombies_spawned += 1
-
-    def check_level_up(self):
-        if self.orbs_collected >= self.orbs_needed:
-            self.level += 1
-            self.orbs_collected = 0
-            self.orbs_needed = self.level * 10
-            self.player.update_shoot_speed(self.level)
-            return True
-        return False
-
-    def check_collisions(self):
-        # Implementation similar to the original game
-        pass
+        if self.restarted_clock:
+            # The first interval after the clock was stopped can span all the time it was stopped
+            # (Android freezes the whole process in the background); the game picks up where it was
+            dt = min(dt, self.update_interval)
+            self.restarted_clock = False
+        # Run however many fixed ticks the time since the last frame covers; FixedStep drops
+        # the backlog past its cap rather than stalling
+        steps = self.timestep.advance(dt * 1000)
+        if steps:
+            inputs = self.read_input()
+            for _ in range(steps):
+                if self.sim.step(inputs):
+                    break
+        self.draw_frame(self.timestep.alpha)
+        if self.sim.game_over:
+            self.update_clock()
+
+    def draw_frame(self, alpha):
+        self.renderer.draw(self.sim, alpha)
 
 class ZombieShooterApp(App):
     def build(self):
-        game = GameWidget()
+        self.game = GameWidget()
         Window.size = (SCREEN_WIDTH, SCREEN_HEIGHT)
-        return game
+        return self.game
+
+    def on_pause(self):
+        self.game.suspend()
+        return True  # Keep the app alive in the background instead of closing it
+
+    def on_resume(self):
+        self.game.resume()
 
 if __name__ == '__main__':
-    ZombieShooterApp().run()
\ No newline at end of file
+    ZombieShooterApp().run()
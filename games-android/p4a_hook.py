@@ -0,0 +1,19 @@
+"""python-for-android build hook (p4a.hook in buildozer.spec).
+
+The simulation core lives in games-python and is shared with the pygame
+frontend. Before the APK is assembled, its modules are copied into the app's
+private directory, next to main.py, so they ship in the package.
+"""
+import os
+import shutil
+
+CORE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'games-python')
+# Everything zombie_engine imports, directly or not
+CORE_MODULES = ('zombie_engine', 'pool', 'horde', 'layers', 'orbs', 'projectiles',
+                'spatial_hash', 'timestep', 'frame_timing')
+
+
+def before_apk_build(toolchain):
+    private = toolchain.args.private
+    for name in CORE_MODULES:
+        shutil.copy(os.path.join(CORE_DIR, name + '.py'), private)
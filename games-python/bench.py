@@ -0,0 +1,297 @@
+"""Scenario benchmarks for the simulation.
+
+Each scenario builds a seeded Simulation in a known hot phase of a run and
+steps it with scripted inputs for a fixed number of ticks. The player is
+made unkillable so every scenario runs its full length. Per scenario it
+reports ticks/s, p50/p95/p99/max tick time, peak entity counts and entity
+pool usage, writes them as JSON and can compare them against a stored baseline:
+
+    python bench.py --out bench.json
+    python bench.py --baseline bench.json
+    python bench.py --only boss final_boss --render
+
+The simulation is the same core both frontends run, so the plain ticks/s
+hold for desktop and Android alike. --render also draws and presents every
+tick through the pygame frontend (on SDL's dummy driver unless a display
+driver is set), so drawing cost is included; add --dirty-rects to render
+through the dirty-rect renderer, or --backend renderer to draw with SDL's
+Renderer and Textures instead. Rendering is at full quality unless --quality
+pins a lower tier. --frontend kivy renders through the Kivy (Android) frontend
+on an offscreen window instead.
+"""
+import argparse
+import importlib.util
+import json
+import math
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+
+from zombie_engine import InputState, Simulation
+from horde import GREEN, BUFF, BLACK, BLACK_SHOOT_DELAY
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+GOD_MODE_HEALTH = 1e12  # Keeps the player alive for the whole scenario
+
+
+def set_level(sim, level):
+    sim.level = level
+    sim.orbs_needed = level * 10
+    sim.player.update_shoot_speed(level)
+
+
+def spawn_ring(sim, count, kind, radius=320):
+    """Spawn `count` zombies of one kind scattered on a ring around the player"""
+    rng = sim.rng
+    for _ in range(count):
+        angle = rng.uniform(0, 2 * math.pi)
+        distance = radius * rng.uniform(0.8, 1.2)
+        sim.zombies.spawn(sim.player.x + math.cos(angle) * distance,
+                          sim.player.y + math.sin(angle) * distance, kind)
+
+
+def setup_early(sim):
+    """Level 1: normal zombies trickling in, every fifth one buff"""
+
+
+def setup_mid(sim):
+    """Level 7: the buff/green mix"""
+    set_level(sim, 7)
+    spawn_ring(sim, 40, BUFF)
+    spawn_ring(sim, 8, GREEN)
+
+
+def setup_swarm(sim):
+    """Level 12: a green swarm with black zombies firing SmallBullet rings"""
+    set_level(sim, 12)
+    spawn_ring(sim, 150, GREEN)
+    spawn_ring(sim, 12, BLACK, radius=260)
+    # Stagger the black zombies so rings go off throughout the run
+    n = len(sim.zombies)
+    black = np.flatnonzero(sim.zombies.kind[:n] == BLACK)
+    sim.zombies.last_shot[black] = -np.linspace(0, BLACK_SHOOT_DELAY, len(black), endpoint=False)
+
+
+def setup_boss(sim):
+    """Level 15: the Boss fight and its 20-bullet bursts"""
+    set_level(sim, 15)
+
+
+def setup_final_boss(sim):
+    """Level 25: the FinalBoss fight, 30-bullet bursts, then its 500-orb drop"""
+    set_level(sim, 25)
+    sim.spawn_final_boss()
+    # Weakened so it dies partway through and the orb drop is part of the run
+    sim.final_boss.health = 1500
+
+
+# name -> (setup, seed, ticks)
+SCENARIOS = {
+    'early': (setup_early, 101, 3600),
+    'mid': (setup_mid, 202, 3600),
+    'swarm': (setup_swarm, 303, 3600),
+    'boss': (setup_boss, 404, 3600),
+    'final_boss': (setup_final_boss, 505, 3600),
+}
+
+# Strafing pattern: a direction change every 45 ticks
+MOVES = ((True, False, False, True), (False, True, False, True),
+         (False, True, True, False), (True, False, True, False))
+
+
+def scripted_input(sim, tick):
+    """Deterministic inputs: strafe in a loop and sweep the aim around the player"""
+    up, down, left, right = MOVES[(tick // 45) % len(MOVES)]
+    angle = tick * 0.03
+    aim = (sim.player.x + math.cos(angle) * 200, sim.player.y + math.sin(angle) * 200)
+    return InputState(up=up, down=down, left=left, right=right, aim=aim)
+
+
+def load_module(name, path):
+    """Import a frontend script by path (neither file name is a module we can import)"""
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def load_frontend():
+    """Import the pygame frontend with a headless display"""
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    return load_module('zombie_shooter', os.path.join(HERE, 'zombie-shooter-v1.0.py'))
+
+
+class KivyFrontend:
+    """The Kivy frontend's GameWidget on an offscreen window, driven like the pygame Game"""
+    def __init__(self):
+        os.environ.setdefault('KIVY_NO_ARGS', '1')  # Otherwise Kivy parses our command line
+        os.environ.setdefault('KIVY_NO_CONSOLELOG', '1')
+        os.environ.setdefault('SDL_VIDEODRIVER', 'offscreen')
+        module = load_module('kivy_zombie_shooter', os.path.join(HERE, '..', 'games-android', 'main.py'))
+        from kivy.core.window import Window
+        self.window = Window
+        Window.size = (module.SCREEN_WIDTH, module.SCREEN_HEIGHT)
+        self.widget = module.GameWidget()
+        self.widget.suspend()  # The benchmark steps the simulation itself
+        Window.add_widget(self.widget)
+
+    @property
+    def sim(self):
+        return self.widget.sim
+
+    @sim.setter
+    def sim(self, sim):
+        self.widget.sim = sim
+
+    def draw_frame(self, alpha):
+        self.widget.draw_frame(alpha)
+
+    def present(self):
+        self.window.dispatch('on_draw')
+        self.window.dispatch('on_flip')
+
+
+def build_scenario(name):
+    """A fresh Simulation set up for scenario `name`, and the scenario's default tick count"""
+    setup, seed, ticks = SCENARIOS[name]
+    sim = Simulation(seed=seed)
+    sim.player.health = sim.player.max_health = GOD_MODE_HEALTH
+    setup(sim)
+    return sim, ticks
+
+
+def run_scenario(name, ticks=None, game=None):
+    """Run one scenario. Returns its result dict"""
+    sim, default_ticks = build_scenario(name)
+    seed = sim.seed
+    ticks = ticks or default_ticks
+    if game:
+        game.sim = sim
+
+    times = np.empty(ticks, dtype=np.float64)
+    peak = sim.entity_counts()
+    clock = time.perf_counter
+    start = clock()
+    for tick in range(ticks):
+        inputs = scripted_input(sim, tick)
+        t0 = clock()
+        sim.step(inputs)
+        if game:
+            game.draw_frame(1.0)
+            game.present()
+        times[tick] = clock() - t0
+        for key, count in sim.entity_counts().items():
+            if count > peak[key]:
+                peak[key] = count
+    elapsed = clock() - start
+
+    ms = times * 1000
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+    return {
+        'seed': seed,
+        'ticks': ticks,
+        'seconds': round(elapsed, 4),
+        'ticks_per_sec': round(ticks / elapsed, 1),
+        'p50_ms': round(float(p50), 4),
+        'p95_ms': round(float(p95), 4),
+        'p99_ms': round(float(p99), 4),
+        'max_ms': round(float(ms.max()), 4),
+        'peak': peak,
+        'pools': sim.pool_stats(),
+        'final': {'score': sim.score, 'level': sim.level},
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Print each scenario against the baseline. Returns the names that regressed"""
+    regressed = []
+    print(f"\n{'scenario':<12} {'ticks/s':>18} {'p95 ms':>18} {'p99 ms':>18}")
+    for name, result in results.items():
+        base = baseline.get('scenarios', {}).get(name)
+        if not base:
+            print(f"{name:<12} (not in baseline)")
+            continue
+        cells = []
+        for key in ('ticks_per_sec', 'p95_ms', 'p99_ms'):
+            ratio = result[key] / base[key] if base[key] else 1.0
+            cells.append(f"{base[key]:>7g} -> {ratio:5.2f}x")
+        speed = result['ticks_per_sec'] / base['ticks_per_sec']
+        if speed < 1 - tolerance:
+            regressed.append(name)
+        print(f"{name:<12} {cells[0]:>18} {cells[1]:>18} {cells[2]:>18}" +
+              ("  REGRESSION" if name in regressed else ""))
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Zombie Shooter scenario benchmarks")
+    parser.add_argument('--only', nargs='+', choices=sorted(SCENARIOS), help="scenarios to run")
+    parser.add_argument('--ticks', type=int, default=None, help="override every scenario's tick count")
+    parser.add_argument('--render', action='store_true', help="also draw each tick through a frontend")
+    parser.add_argument('--frontend', choices=('pygame', 'kivy'), default='pygame',
+                        help="with --render, the frontend to draw through (default pygame)")
+    parser.add_argument('--dirty-rects', action='store_true', help="with --render, use the dirty-rect renderer")
+    parser.add_argument('--backend', choices=('surface', 'renderer'), default='surface',
+                        help="with --render, the frontend's drawing backend")
+    parser.add_argument('--quality', type=int, default=0, metavar='TIER',
+                        help="with --render, the quality tier to draw at (default 0, full)")
+    parser.add_argument('--out', metavar='PATH', help="write results as JSON")
+    parser.add_argument('--baseline', metavar='PATH', help="compare against a previous --out file")
+    parser.add_argument('--tolerance', type=float, default=0.10,
+                        help="ticks/s drop vs baseline that counts as a regression (default 0.10)")
+    args = parser.parse_args()
+
+    if args.dirty_rects and args.backend != 'surface':
+        parser.error("--dirty-rects only applies to the surface backend")
+    if args.frontend == 'kivy' and (args.dirty_rects or args.backend != 'surface' or args.quality):
+        parser.error("--dirty-rects, --backend and --quality only apply to the pygame frontend")
+    game = None
+    if args.render and args.frontend == 'kivy':
+        game = KivyFrontend()
+    elif args.render:
+        game = load_frontend().Game(dirty_rects=args.dirty_rects, backend=args.backend, quality=args.quality)
+    names = args.only or list(SCENARIOS)
+    results = {}
+    for name in names:
+        result = run_scenario(name, args.ticks, game)
+        results[name] = result
+        peak = ', '.join(f"{key} {count}" for key, count in result['peak'].items())
+        print(f"{name:<12} {result['ticks_per_sec']:>9.0f} ticks/s  p50 {result['p50_ms']:.3f}  "
+              f"p95 {result['p95_ms']:.3f}  p99 {result['p99_ms']:.3f} ms  peak: {peak}")
+        # A pool that had to grow mid-run is a capacity worth raising
+        grown = ', '.join(f"{key} {stats['capacity']} after {stats['grows']} grows"
+                          for key, stats in result['pools'].items() if stats['grows'])
+        if grown:
+            print(f"{'':<12} pools grew: {grown}")
+
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'render': args.render,
+            'frontend': args.frontend if args.render else None,
+            'dirty_rects': args.render and args.dirty_rects,
+            'backend': args.backend if args.render else None,
+            'quality': args.quality if args.render else None,
+        },
+        'scenarios': results,
+    }
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get('meta', {}).get('render') != args.render:
+            print("warning: baseline was recorded with a different --render setting")
+        if compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
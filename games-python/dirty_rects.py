@@ -0,0 +1,110 @@
+"""Dirty-rectangle bookkeeping for the pygame frontend.
+
+The game is drawn on a plain black background, so from one frame to the next
+the only pixels that change are under what was drawn last frame and what is
+drawn this frame. DirtyRects keeps both as a coarse grid of tiles: the draw
+code marks the boxes it draws into, clear() paints the background back over
+last frame's tiles instead of filling the whole screen, and present() hands
+the union of last frame's and this frame's tiles to display.update() as one
+rect per horizontal run of tiles.
+
+Once that union covers more than `threshold` of the screen, updating rect by
+rect costs about as much as the whole surface, so it falls back to a full
+fill and flip. invalidate() forces that for the next frame too (first frame,
+window exposed).
+"""
+import numpy as np
+import pygame
+
+
+class DirtyRects:
+    def __init__(self, size, tile=32, threshold=0.5):
+        width, height = size
+        self.tile = tile
+        self.threshold = threshold
+        self.bounds = pygame.Rect(0, 0, width, height)
+        self.shape = (-(-height // tile), -(-width // tile))  # Rows and columns, rounded up
+        self.boxes = []  # (x, y, w, h) arrays marked this frame, resolved to tiles in drawn()
+        self.rects = []  # Single rects marked this frame
+        self.last = np.zeros(self.shape, dtype=bool)  # Tiles drawn into last frame
+        self.full = True  # Repaint and flip the whole screen this frame
+        self.coverage = 1.0  # Fraction of the screen presented last frame
+        self.flips = 0
+        self.updates = 0
+
+    def invalidate(self):
+        """Repaint and present the whole screen next frame"""
+        self.full = True
+
+    def add(self, rect):
+        """Mark one Rect (or (x, y, w, h)) as drawn into"""
+        self.rects.append(tuple(rect))
+
+    def add_boxes(self, x, y, w, h):
+        """Mark many boxes at once: integer arrays of left and top, width and height arrays or scalars"""
+        if len(x):
+            self.boxes.append((x, y, np.broadcast_to(w, x.shape), np.broadcast_to(h, x.shape)))
+
+    def drawn(self):
+        """Boolean tile grid of everything marked since clear()"""
+        rows, cols = self.shape
+        boxes = self.boxes
+        if self.rects:
+            boxes = boxes + [np.array(self.rects).T]
+        if not boxes:
+            return np.zeros(self.shape, dtype=bool)
+        x, y, w, h = (np.concatenate(column) for column in zip(*boxes))
+        t = self.tile
+        left = np.maximum(x // t, 0)
+        top = np.maximum(y // t, 0)
+        # One past the last tile each box touches
+        right = np.minimum((x + w - 1) // t + 1, cols)
+        bottom = np.minimum((y + h - 1) // t + 1, rows)
+        keep = (left < right) & (top < bottom) & (w > 0) & (h > 0)
+        left, top, right, bottom = left[keep], top[keep], right[keep], bottom[keep]
+        # +1 at each box's top-left and bottom-right tile corners, -1 at the other two; summing
+        # the grid down and across then leaves a positive count on every tile under some box
+        stride = cols + 1
+        index = np.concatenate((top * stride + left, bottom * stride + right,
+                                top * stride + right, bottom * stride + left))
+        weights = np.ones(len(index))
+        weights[len(index) // 2:] = -1
+        counts = np.bincount(index, weights, minlength=(rows + 1) * stride).reshape(rows + 1, stride)
+        return counts.cumsum(axis=0).cumsum(axis=1)[:rows, :cols] > 0.5
+
+    def runs(self, tiles):
+        """One screen-clipped Rect per horizontal run of marked tiles"""
+        t = self.tile
+        rows, cols = self.shape
+        padded = np.zeros((rows, cols + 2), dtype=np.int8)
+        padded[:, 1:-1] = tiles
+        edges = np.diff(padded, axis=1)
+        run_rows, starts = np.nonzero(edges == 1)
+        _, ends = np.nonzero(edges == -1)
+        bounds = self.bounds
+        return [pygame.Rect(start * t, row * t, (end - start) * t, t).clip(bounds)
+                for row, start, end in zip(run_rows.tolist(), starts.tolist(), ends.tolist())]
+
+    def clear(self, screen, color):
+        """Paint the background over everything drawn last frame, and start marking a new one"""
+        if self.full or self.last.mean() > self.threshold:
+            screen.fill(color)
+        else:
+            for rect in self.runs(self.last):
+                screen.fill(color, rect)
+        self.boxes = []
+        self.rects = []
+
+    def present(self):
+        """Show this frame: update the tiles drawn last frame and this one, or flip if that's most of the screen"""
+        drawn = self.drawn()
+        dirty = self.last | drawn
+        self.coverage = 1.0 if self.full else float(dirty.mean())
+        if self.coverage > self.threshold:
+            pygame.display.flip()
+            self.flips += 1
+        else:
+            pygame.display.update(self.runs(dirty))
+            self.updates += 1
+        self.full = False
+        self.last = drawn
@@ -0,0 +1,99 @@
+"""Per-phase frame timing.
+
+A PhaseTimer is a stopwatch that gets lapped at the end of every phase of a
+frame: each lap() charges the time since the previous lap to the named
+phase. end_frame() pushes the frame's per-phase totals into fixed-size ring
+buffers (for the live overlay's rolling averages) and, if a CSV file is
+open, streams them out as one row per frame.
+
+When timing is off, the Simulation holds NULL_TIMER, whose lap() does
+nothing, so the hooks cost one no-op call per phase.
+"""
+import csv
+import time
+
+import numpy as np
+
+
+class NullTimer:
+    def lap(self, phase):
+        pass
+
+
+NULL_TIMER = NullTimer()
+
+
+class PhaseTimer:
+    def __init__(self, phases, window=120, clock=time.perf_counter):
+        self.phases = tuple(phases)
+        self.slots = {name: i for i, name in enumerate(self.phases)}
+        self.window = window
+        self.clock = clock
+        # Ring buffers, one row per frame, in milliseconds
+        self.history = np.zeros((window, len(self.phases)))
+        self.frame_ms = np.zeros(window)
+        self.frames = 0
+        self.current = [0.0] * len(self.phases)
+        self.last = self.frame_start = clock()
+        self.csv_file = None
+        self.csv_writer = None
+        self.count_names = ()
+
+    def restart(self):
+        """Start a fresh frame now, dropping whatever was lapped since the last one closed"""
+        self.current = [0.0] * len(self.phases)
+        self.last = self.frame_start = self.clock()
+
+    def lap(self, phase):
+        """Charge the time since the previous lap to `phase`"""
+        now = self.clock()
+        self.current[self.slots[phase]] += now - self.last
+        self.last = now
+
+    def end_frame(self, counts=None):
+        """Close the frame: store its phase times and write a CSV row if streaming.
+
+        `counts` is an optional {name: value} of entity counts for the CSV.
+        """
+        now = self.clock()
+        row = self.frames % self.window
+        self.history[row] = self.current
+        self.history[row] *= 1000
+        frame_ms = (now - self.frame_start) * 1000
+        self.frame_ms[row] = frame_ms
+        if self.csv_writer:
+            values = [counts.get(name, 0) for name in self.count_names] if counts else []
+            self.csv_writer.writerow([self.frames, round(frame_ms, 4)] +
+                                     [round(t, 4) for t in self.history[row]] + values)
+        self.frames += 1
+        self.current = [0.0] * len(self.phases)
+        self.last = self.frame_start = now
+
+    def averages(self):
+        """Mean ms per phase over the ring buffer"""
+        n = min(self.frames, self.window)
+        if n == 0:
+            return dict.fromkeys(self.phases, 0.0)
+        return dict(zip(self.phases, self.history[:n].mean(axis=0).tolist()))
+
+    def mean_frame_ms(self):
+        n = min(self.frames, self.window)
+        return float(self.frame_ms[:n].mean()) if n else 0.0
+
+    def fps(self):
+        frame_ms = self.mean_frame_ms()
+        return 1000 / frame_ms if frame_ms else 0.0
+
+    def open_csv(self, path, count_names=()):
+        """Stream every frame from now on to a CSV file at path"""
+        self.count_names = tuple(count_names)
+        self.csv_file = open(path, 'w', newline='')
+        self.csv_writer = csv.writer(self.csv_file)
+        self.csv_writer.writerow(['frame', 'frame_ms'] + [f"{name}_ms" for name in self.phases] +
+                                 list(self.count_names))
+
+    def close(self):
+        if self.csv_file:
+            self.csv_file.close()
+            self.csv_file = None
+            self.csv_writer = None
@@ -0,0 +1,101 @@
+"""Struct-of-arrays zombie horde.
+
+All regular zombies live in NumPy columns (position, speed, size, health,
+kind, last shot) so the whole horde chases the player in one batched step
+per tick. Per-type stats come from lookup tables indexed by kind instead of
+is_buff/is_green/is_black branches.
+"""
+import math
+
+import numpy as np
+
+from pool import ColumnPool
+
+# Zombie kinds
+NORMAL = 0
+BUFF = 1
+GREEN = 2
+BLACK = 3
+
+# Per-kind tables, indexed by kind: normal, buff, green, black
+KIND_SIZE = np.array([15, 45, 7, 35], dtype=np.float64)  # Buff 3x bigger, green 2x smaller
+KIND_SPEED = np.array([1.5, 1.0, 2.0, 1.2], dtype=np.float64)
+KIND_HEALTH = np.array([2, 16, 112, 560], dtype=np.float64)  # Black has 5x green health
+KIND_ORBS = (2, 7, 2, 2)  # Orbs dropped on death
+KIND_SCORE = (10, 80, 10, 10)  # Points on death (8x for buff)
+
+BLACK_SHOOT_DELAY = 4000  # Black enemies shoot every 4 seconds
+
+
+def chase_step(x, y, speed, target_x, target_y):
+    """Move one point `speed` pixels toward the target. Returns the new (x, y)"""
+    dx = target_x - x
+    dy = target_y - y
+    distance = math.sqrt(dx * dx + dy * dy)
+    if distance > 0:
+        # Normalize and apply speed
+        x += (dx / distance) * speed
+        y += (dy / distance) * speed
+    return x, y
+
+
+class ZombieHorde(ColumnPool):
+    COLUMNS = (
+        ('x', np.float64), ('y', np.float64), ('speed', np.float64), ('size', np.float64),
+        ('health', np.float64), ('max_health', np.float64),
+        ('kind', np.int8), ('last_shot', np.float64),
+    )
+    INTERPOLATED = ('x', 'y')
+
+    def __init__(self, capacity=256):
+        super().__init__(capacity)
+
+    def spawn(self, x, y, kind):
+        """Add one zombie of the given kind at (x, y)"""
+        i = self.acquire()
+        self.x[i] = x
+        self.y[i] = y
+        self.speed[i] = KIND_SPEED[kind]
+        self.size[i] = KIND_SIZE[kind]
+        self.health[i] = KIND_HEALTH[kind]
+        self.max_health[i] = KIND_HEALTH[kind]
+        self.kind[i] = kind
+        self.last_shot[i] = 0
+
+    def update(self, target_x, target_y):
+        """Move every zombie toward the target at its own speed, in one batched step"""
+        n = self.count
+        if n == 0:
+            return
+        x = self.x[:n]
+        y = self.y[:n]
+        dx = target_x - x
+        dy = target_y - y
+        distance = np.sqrt(dx * dx + dy * dy)
+        moving = distance > 0
+        # Zombies already on the target stay put (their dx and dy are zero)
+        distance[~moving] = 1.0
+        speed = self.speed[:n]
+        x += (dx / distance) * speed
+        y += (dy / distance) * speed
+
+    def shoot(self, current_time, projectiles, ring, bullet_kind):
+        """Every black zombie whose cooldown is up fires `ring` (dx, dy arrays) around itself"""
+        n = self.count
+        if n == 0:
+            return
+        last_shot = self.last_shot[:n]
+        ready = (self.kind[:n] == BLACK) & (current_time - last_shot > BLACK_SHOOT_DELAY)
+        if not ready.any():
+            return
+        shooters = np.flatnonzero(ready)
+        ring_dx, ring_dy = ring
+        per_ring = len(ring_dx)
+        start, end = projectiles.acquire_kind(per_ring * len(shooters), bullet_kind)
+        # Write each shooter's ring straight into the pool, one (shooters, ring) block
+        blocks = (len(shooters), per_ring)
+        projectiles.x[start:end].reshape(blocks)[:] = self.x[shooters, None]
+        projectiles.y[start:end].reshape(blocks)[:] = self.y[shooters, None]
+        projectiles.dx[start:end].reshape(blocks)[:] = ring_dx
+        projectiles.dy[start:end].reshape(blocks)[:] = ring_dy
+        last_shot[shooters] = current_time
@@ -0,0 +1,32 @@
+"""Collision layers.
+
+Every collidable group in the game belongs to one layer bit, and
+COLLISION_MATRIX says which layers interact. The engine only runs a
+collision pass for pairs the matrix enables, so there is no per-bullet
+"what am I?" test in the hot loop. Adding a projectile type means giving its
+kind a layer in projectiles.KIND_LAYER, not touching the collision code.
+"""
+
+PLAYER = 1 << 0
+PLAYER_SHOTS = 1 << 1
+ZOMBIES = 1 << 2
+BOSSES = 1 << 3
+HOSTILE_SHOTS = 1 << 4
+
+# Layer -> bitmask of the layers it hits
+COLLISION_MATRIX = {
+    PLAYER_SHOTS: ZOMBIES | BOSSES,
+    HOSTILE_SHOTS: PLAYER,
+    ZOMBIES: PLAYER,
+    BOSSES: PLAYER,
+}
+
+
+def collides(a, b, matrix=COLLISION_MATRIX):
+    """True if layers a and b interact, in either direction"""
+    return bool(matrix.get(a, 0) & b or matrix.get(b, 0) & a)
+
+
+def enabled_pairs(pairs, matrix=COLLISION_MATRIX):
+    """Filter (layer_a, layer_b, ...) entries down to the ones the matrix enables"""
+    return [pair for pair in pairs if collides(pair[0], pair[1], matrix)]
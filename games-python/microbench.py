@@ -0,0 +1,242 @@
+"""Scaling microbenchmarks for the per-tick hot functions.
+
+Each case builds a fresh state holding N entities, times one call of the
+function under test, and repeats; the median time per call is recorded for
+every N in the sweep. A least-squares fit of log(time) against log(N) over
+the larger sizes gives the empirical exponent: about 1 for linear work,
+about 2 for quadratic. Cases whose exponent comes out well above what they
+should be are flagged, which is how an accidental copy-per-bullet or
+all-pairs loop shows up before it ships:
+
+    python microbench.py
+    python microbench.py --only collisions horde.update --sizes 100 1000 10000
+    python microbench.py --draw --out micro.json
+
+Collision cases spread entities over an area that grows with N, so entity
+density (and the true number of overlapping pairs per entity) stays fixed.
+"""
+import argparse
+import functools
+import json
+import math
+import statistics
+import sys
+import time
+
+import numpy as np
+
+from zombie_engine import SCREEN_WIDTH, SCREEN_HEIGHT, Simulation, Boss, FinalBoss
+from horde import ZombieHorde, KIND_SIZE, KIND_SPEED, KIND_HEALTH, NORMAL, BLACK
+from projectiles import ProjectileStore, ring, BULLET, RED_BULLET, SMALL_BULLET, BOSS_BULLET
+from orbs import OrbStore
+from layers import HOSTILE_SHOTS
+from bench import load_frontend
+
+frontend = functools.lru_cache(maxsize=None)(load_frontend)
+
+DEFAULT_SIZES = (10, 30, 100, 300, 1000, 3000, 10000)
+FIT_FROM = 100  # Smaller sizes are dominated by fixed per-call overhead
+DENSITY_AREA = SCREEN_WIDTH * SCREEN_HEIGHT / 1000  # Square pixels per entity in collision cases
+
+
+def fill_zombies(horde, n, rng, kind=NORMAL, width=SCREEN_WIDTH, height=SCREEN_HEIGHT):
+    """Append n zombies of one kind at uniform random positions, in one block"""
+    start = horde.acquire(n)
+    end = start + n
+    horde.x[start:end] = rng.uniform(0, width, n)
+    horde.y[start:end] = rng.uniform(0, height, n)
+    horde.speed[start:end] = KIND_SPEED[kind]
+    horde.size[start:end] = KIND_SIZE[kind]
+    horde.health[start:end] = KIND_HEALTH[kind]
+    horde.max_health[start:end] = KIND_HEALTH[kind]
+    horde.kind[start:end] = kind
+    horde.last_shot[start:end] = -1e9
+
+
+def fill_shots(store, n, rng, kind, width=SCREEN_WIDTH, height=SCREEN_HEIGHT):
+    start, end = store.acquire_kind(n, kind)
+    store.x[start:end] = rng.uniform(0, width, n)
+    store.y[start:end] = rng.uniform(0, height, n)
+    store.dx[start:end] = rng.uniform(-5, 5, n)
+    store.dy[start:end] = rng.uniform(-5, 5, n)
+
+
+def case_collisions(n, rng):
+    """Simulation.check_collisions with n zombies and n player bullets at fixed density"""
+    side = math.sqrt(n * DENSITY_AREA)
+    sim = Simulation(seed=0)
+    sim.player.x = sim.player.y = side / 2
+    sim.player.health = 1e12
+    fill_zombies(sim.zombies, n, rng, width=side, height=side)
+    fill_shots(sim.player_bullets, n, rng, BULLET, width=side, height=side)
+    fill_shots(sim.enemy_bullets, n // 4, rng, SMALL_BULLET, width=side, height=side)
+    return lambda: sim.check_collisions(1.0)
+
+
+def case_horde_update(n, rng):
+    """ZombieHorde.update: chase the player with n zombies"""
+    horde = ZombieHorde()
+    fill_zombies(horde, n, rng)
+    return lambda: horde.update(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2)
+
+
+def case_horde_shoot(n, rng):
+    """ZombieHorde.shoot: n black zombies all firing their ring"""
+    horde = ZombieHorde()
+    fill_zombies(horde, n, rng, kind=BLACK)
+    store = ProjectileStore(SCREEN_WIDTH, SCREEN_HEIGHT, HOSTILE_SHOTS)
+    burst = ring(10, 4)
+    return lambda: horde.shoot(1e9, store, burst, SMALL_BULLET)
+
+
+def case_orbs_update(n, rng):
+    """OrbStore.update: magnet and collection with n orbs around the player"""
+    orbs = OrbStore()
+    orbs.add_block(rng.uniform(300, 500, n), rng.uniform(200, 400, n))
+    return lambda: orbs.update(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2)
+
+
+def case_projectiles_update(n, rng):
+    """ProjectileStore.update: move and cull n bullets"""
+    store = ProjectileStore(SCREEN_WIDTH, SCREEN_HEIGHT, HOSTILE_SHOTS)
+    fill_shots(store, n, rng, SMALL_BULLET)
+    return store.update
+
+
+def case_player_shoot(n, rng):
+    """Player.shoot at a level with n red bullet streams"""
+    sim = Simulation(seed=0)
+    store = sim.player_bullets
+    return lambda: sim.player.shoot((700, 300), 1e9, n + 6, store)
+
+
+def case_boss_shoot(n, rng):
+    """Boss.shoot and FinalBoss.shoot into a store already holding n bullets"""
+    sim = Simulation(seed=0)
+    store = sim.enemy_bullets
+    fill_shots(store, n, rng, BOSS_BULLET)
+    boss = Boss(100, 100)
+    final_boss = FinalBoss(400, 300)
+
+    def call():
+        boss.shoot(sim.player, 1e9, store)
+        final_boss.shoot(sim.player, 1e9, store)
+        boss.last_shot = final_boss.last_shot = 0
+    return call
+
+
+def draw_case(draw_name, fill):
+    """Wrap a frontend draw_* function as a case; fill(sim, n, rng) sets up the entities"""
+    def case(n, rng):
+        module = frontend()
+        screen = module.pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        module.build_atlas()
+        sim = Simulation(seed=0)
+        target = fill(sim, n, rng)
+        draw = getattr(module, draw_name)
+        return lambda: draw(screen, target, 1.0)
+    return case
+
+
+def fill_draw_zombies(sim, n, rng):
+    fill_zombies(sim.zombies, n, rng)
+    sim.zombies.health[:n] *= 0.5  # Damaged, so health bars are drawn too
+    return sim.zombies
+
+
+def fill_draw_bullets(sim, n, rng):
+    for kind in (BULLET, RED_BULLET, SMALL_BULLET, BOSS_BULLET):
+        fill_shots(sim.enemy_bullets, n // 4, rng, kind)
+    return sim.enemy_bullets
+
+
+def fill_draw_orbs(sim, n, rng):
+    sim.orbs.add_block(rng.uniform(0, SCREEN_WIDTH, n), rng.uniform(0, SCREEN_HEIGHT, n))
+    return sim.orbs
+
+
+# name -> (case, expected exponent, needs the pygame frontend)
+CASES = {
+    'collisions': (case_collisions, 1, False),
+    'horde.update': (case_horde_update, 1, False),
+    'horde.shoot': (case_horde_shoot, 1, False),
+    'orbs.update': (case_orbs_update, 1, False),
+    'projectiles.update': (case_projectiles_update, 1, False),
+    'player.shoot': (case_player_shoot, 1, False),
+    'boss.shoot': (case_boss_shoot, 0, False),
+    'draw_zombies': (draw_case('draw_zombies', fill_draw_zombies), 1, True),
+    'draw_bullets': (draw_case('draw_bullets', fill_draw_bullets), 1, True),
+    'draw_orbs': (draw_case('draw_orbs', fill_draw_orbs), 1, True),
+}
+
+
+def time_case(case, n, repeats, seed=0):
+    """Median seconds per call over `repeats` fresh setups of size n"""
+    rng = np.random.default_rng(seed)
+    times = []
+    for _ in range(repeats):
+        call = case(n, rng)
+        start = time.perf_counter()
+        call()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def fit_exponent(sizes, times):
+    """Slope of log(time) against log(n): the empirical complexity exponent"""
+    points = [(n, t) for n, t in zip(sizes, times) if n >= FIT_FROM and t > 0]
+    if len(points) < 2:
+        points = list(zip(sizes, times))
+    if len(points) < 2:
+        return None
+    log_n = np.log([n for n, _ in points])
+    log_t = np.log([t for _, t in points])
+    slope, _ = np.polyfit(log_n, log_t, 1)
+    return float(slope)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scaling microbenchmarks for per-tick hot functions")
+    parser.add_argument('--only', nargs='+', choices=sorted(CASES), help="cases to run")
+    parser.add_argument('--sizes', nargs='+', type=int, default=DEFAULT_SIZES, help="entity counts to sweep")
+    parser.add_argument('--repeats', type=int, default=7, help="fresh setups timed per size (median is kept)")
+    parser.add_argument('--draw', action='store_true', help="include the pygame draw_* cases")
+    parser.add_argument('--slack', type=float, default=0.4,
+                        help="how far above its expected exponent a case may fit before it is flagged")
+    parser.add_argument('--out', metavar='PATH', help="write the curves and fits as JSON")
+    args = parser.parse_args()
+
+    names = args.only or [name for name, (_, _, needs_draw) in CASES.items() if args.draw or not needs_draw]
+    sizes = sorted(args.sizes)
+    results = {}
+    flagged = []
+    print(f"{'case':<20}" + ''.join(f"{n:>10}" for n in sizes) + f"{'exponent':>10}")
+    for name in names:
+        case, expected, _ = CASES[name]
+        times = [time_case(case, n, args.repeats) for n in sizes]
+        exponent = fit_exponent(sizes, times)
+        bad = exponent is not None and exponent > expected + args.slack
+        if bad:
+            flagged.append(name)
+        results[name] = {
+            'sizes': sizes,
+            'us_per_call': [round(t * 1e6, 2) for t in times],
+            'exponent': None if exponent is None else round(exponent, 3),
+            'expected': expected,
+            'flagged': bad,
+        }
+        fit = '-' if exponent is None else f"{exponent:.2f}"
+        print(f"{name:<20}" + ''.join(f"{t * 1e6:>10.1f}" for t in times) + f"{fit:>10}" +
+              (f"  expected ~{expected}, SUPERLINEAR" if bad else ""))
+    print("(microseconds per call)")
+
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump({'fit_from': FIT_FROM, 'cases': results}, f, indent=2)
+    if flagged:
+        print("flagged: " + ', '.join(flagged))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
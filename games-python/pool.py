@@ -0,0 +1,117 @@
+"""Pre-sized struct-of-arrays entity pools.
+
+A ColumnPool owns one NumPy array per column, allocated up front. Live
+entities are packed into slots [0, count); the tail [count, capacity) is the
+free list, so acquiring slots is O(1) (take from the front of the tail).
+Removal is keep(mask), one boolean-mask compaction of the survivors that
+keeps their order; it stands in for a swap-remove on purpose, since removals
+arrive in batches as masks from the collision, cull and pickup passes. The
+pool never allocates per entity, but a tick that removes anything pays one
+temporary mask copy per column (prev_ twins included) in keep(). The arrays
+only grow, by doubling, if a fight outlives the pre-sized capacity. Every
+pool keeps high-water-mark statistics so capacities can be tuned from real
+runs.
+
+Columns named in INTERPOLATED also get a prev_<name> twin holding the value
+from the start of the current tick, so the renderer can draw between ticks.
+"""
+import numpy as np
+
+
+class ColumnPool:
+    # (name, dtype) pairs, filled in by subclasses
+    COLUMNS = ()
+    # Column names that keep their previous tick's value for render interpolation
+    INTERPOLATED = ()
+
+    def __init__(self, capacity):
+        self.count = 0
+        self.columns = self.COLUMNS + tuple(('prev_' + name, dtype) for name, dtype in self.COLUMNS
+                                            if name in self.INTERPOLATED)
+        for name, dtype in self.columns:
+            setattr(self, name, np.empty(capacity, dtype=dtype))
+        # Statistics
+        self.high_water = 0
+        self.grows = 0
+        self.acquired = 0
+        self.released = 0
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def capacity(self):
+        return len(getattr(self, self.COLUMNS[0][0]))
+
+    def _grow(self, needed):
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        for name, dtype in self.columns:
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+        self.grows += 1
+
+    def acquire(self, count=1):
+        """Take `count` slots from the free list. Returns the first slot index.
+
+        The new slots are contiguous, [start, start + count), and their columns
+        hold stale data until the caller fills them in.
+        """
+        start = self.count
+        end = start + count
+        if end > self.capacity:
+            self._grow(end)
+        self.count = end
+        for name in self.INTERPOLATED:
+            # Newly born entities have no previous position yet; lerp() falls back to the current one
+            getattr(self, 'prev_' + name)[start:end] = np.nan
+        self.acquired += count
+        if end > self.high_water:
+            self.high_water = end
+        return start
+
+    def keep(self, mask):
+        """Release every entity where mask is False in one vectorized pass, preserving order"""
+        kept = int(np.count_nonzero(mask))
+        if kept == self.count:
+            return
+        for name, _ in self.columns:
+            column = getattr(self, name)
+            column[:kept] = column[:self.count][mask]
+        self.released += self.count - kept
+        self.count = kept
+
+    def save_previous(self):
+        """Remember every interpolated column's current value as its previous one"""
+        n = self.count
+        for name in self.INTERPOLATED:
+            getattr(self, 'prev_' + name)[:n] = getattr(self, name)[:n]
+
+    def lerp(self, name, alpha):
+        """Column `name` blended from the previous tick toward the current one by alpha"""
+        n = self.count
+        current = getattr(self, name)[:n]
+        previous = getattr(self, 'prev_' + name)[:n]
+        blended = previous + (current - previous) * alpha
+        born = np.isnan(previous)
+        if born.any():
+            blended[born] = current[born]
+        return blended
+
+    def clear(self):
+        self.released += self.count
+        self.count = 0
+
+    def stats(self):
+        """Pool usage counters, for benchmarks and tuning capacities"""
+        return {
+            'count': self.count,
+            'capacity': self.capacity,
+            'high_water': self.high_water,
+            'grows': self.grows,
+            'acquired': self.acquired,
+            'released': self.released,
+        }
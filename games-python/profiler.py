@@ -0,0 +1,175 @@
+"""Sampling profiler for the game loop.
+
+Every `interval` seconds the main thread's current stack is captured and
+counted. On Unix an ITIMER_REAL interval timer delivers SIGALRM and the
+handler samples the interrupted frame, which lands on whatever bytecode was
+running. Elsewhere a background thread samples sys._current_frames(); that
+thread only gets in when the main thread drops the GIL, so its samples lean
+toward GIL-releasing calls such as NumPy ufuncs. Either way each sample is
+weighted by the wall time since the previous one, so a long C call (a big
+blit, a flip) is charged in full to the Python function that made it.
+
+Functions are named by module and co_qualname (Simulation.check_collisions,
+draw_zombies, Game.draw_world), so samples land on our own classes and
+functions rather than on file:line pairs. Results are written as collapsed
+stacks (one "root;...;leaf microseconds" line per stack, for flamegraph.pl
+and friends) or as a speedscope JSON file, and summarized as a top-N
+self/total table.
+"""
+import collections
+import json
+import os
+import signal
+import sys
+import threading
+import time
+
+SPEEDSCOPE_SCHEMA = 'https://www.speedscope.app/file-format-schema.json'
+
+
+class SamplingProfiler:
+    def __init__(self, interval=0.001, thread_id=None):
+        self.interval = interval
+        self.thread_id = thread_id or threading.main_thread().ident
+        self.stacks = collections.Counter()  # root-first tuple of frame keys -> seconds
+        self.frame_keys = {}  # code object -> (name, file, line)
+        self.samples = 0
+        self.elapsed = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+        self._switch_interval = None
+        self._previous_handler = None
+
+    def frame_key(self, code):
+        key = self.frame_keys.get(code)
+        if key is None:
+            module = os.path.splitext(os.path.basename(code.co_filename))[0]
+            name = getattr(code, 'co_qualname', code.co_name)
+            key = (f"{module}.{name}", code.co_filename, code.co_firstlineno)
+            self.frame_keys[code] = key
+        return key
+
+    def record(self, frame):
+        """Count the stack ending at frame, weighted by the time since the last sample"""
+        now = time.perf_counter()
+        weight = now - self._last_sample
+        self._last_sample = now
+        stack = []
+        while frame is not None:
+            stack.append(self.frame_key(frame.f_code))
+            frame = frame.f_back
+        if stack:
+            stack.reverse()
+            self.stacks[tuple(stack)] += weight
+            self.samples += 1
+
+    def _on_alarm(self, signum, frame):
+        self.record(frame)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.record(sys._current_frames().get(self.thread_id))
+
+    def use_signals(self):
+        """Interval timer signals work on Unix, and only for sampling the main thread from itself"""
+        return (hasattr(signal, 'setitimer') and self.thread_id == threading.main_thread().ident
+                and threading.current_thread() is threading.main_thread())
+
+    def start(self):
+        self._started = self._last_sample = time.perf_counter()
+        if self.use_signals():
+            self._previous_handler = signal.signal(signal.SIGALRM, self._on_alarm)
+            signal.setitimer(signal.ITIMER_REAL, self.interval, self.interval)
+            return
+        # The sampler thread needs the GIL to look at the main thread; ask for it as often as we sample
+        self._switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(min(self._switch_interval, self.interval))
+        self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, self._previous_handler)
+        else:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+            sys.setswitchinterval(self._switch_interval)
+        self.elapsed += time.perf_counter() - self._started
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def top(self, n=25):
+        """[(name, self seconds, total seconds)] for the n functions with the most self time"""
+        self_time = collections.Counter()
+        total_time = collections.Counter()
+        for stack, seconds in self.stacks.items():
+            self_time[stack[-1][0]] += seconds
+            # A recursive function only counts once per stack toward its total
+            for name in {key[0] for key in stack}:
+                total_time[name] += seconds
+        names = sorted(total_time, key=lambda name: (self_time[name], total_time[name]), reverse=True)
+        return [(name, self_time[name], total_time[name]) for name in names[:n]]
+
+    def format_top(self, n=25):
+        total = sum(self.stacks.values()) or 1
+        lines = [f"{self.samples} samples in {self.elapsed:.1f}s",
+                 f"{'self %':>7} {'total %':>8} {'self s':>8}  function"]
+        for name, self_time, total_time in self.top(n):
+            lines.append(f"{100 * self_time / total:7.1f} {100 * total_time / total:8.1f} "
+                         f"{self_time:8.3f}  {name}")
+        return '\n'.join(lines)
+
+    def write_collapsed(self, path):
+        """One "root;...;leaf microseconds" line per distinct stack"""
+        with open(path, 'w') as f:
+            for stack, seconds in sorted(self.stacks.items()):
+                f.write(';'.join(key[0] for key in stack) + f" {round(seconds * 1e6)}\n")
+
+    def write_speedscope(self, path, name='zombie-shooter'):
+        frames = []
+        index = {}
+        samples = []
+        weights = []
+        for stack, seconds in self.stacks.items():
+            row = []
+            for key in stack:
+                if key not in index:
+                    index[key] = len(frames)
+                    frames.append({'name': key[0], 'file': key[1], 'line': key[2]})
+                row.append(index[key])
+            samples.append(row)
+            weights.append(seconds * 1000)
+        document = {
+            '$schema': SPEEDSCOPE_SCHEMA,
+            'name': name,
+            'exporter': 'zombie-shooter profiler',
+            'activeProfileIndex': 0,
+            'shared': {'frames': frames},
+            'profiles': [{
+                'type': 'sampled',
+                'name': name,
+                'unit': 'milliseconds',
+                'startValue': 0,
+                'endValue': sum(weights),
+                'samples': samples,
+                'weights': weights,
+            }],
+        }
+        with open(path, 'w') as f:
+            json.dump(document, f)
+
+    def write(self, path, fmt=None):
+        """Write collapsed stacks, or speedscope JSON when fmt says so or path ends in .json"""
+        if fmt is None:
+            fmt = 'speedscope' if path.endswith('.json') else 'collapsed'
+        if fmt == 'speedscope':
+            self.write_speedscope(path)
+        else:
+            self.write_collapsed(path)
@@ -0,0 +1,89 @@
+"""Struct-of-arrays projectile store.
+
+Bullets (the player's yellow and red shots, black zombie rings, boss and
+final boss bursts) live in contiguous NumPy columns instead of one Python
+object each. The simulation keeps one store per collision layer, so player
+shots and hostile shots never share a collection. A tick advances, culls and
+compacts all of them with a handful of vectorized operations, and bursts are
+appended as whole array blocks.
+"""
+import numpy as np
+
+from pool import ColumnPool
+from layers import PLAYER_SHOTS, HOSTILE_SHOTS
+
+# Projectile kinds
+BULLET = 0             # Player bullet (yellow)
+RED_BULLET = 1         # Player bullet from level 7 (red, 7x damage)
+SMALL_BULLET = 2       # Black zombie ring bullet
+BOSS_BULLET = 3        # Boss burst bullet
+FINAL_BOSS_BULLET = 4  # Final boss burst bullet
+
+# Per-kind tables, indexed by kind
+KIND_SIZE = np.array([3, 3, 4, 20, 8], dtype=np.float64)
+KIND_DAMAGE = np.array([1, 7, 1, 2, 0.5], dtype=np.float64)
+KIND_LAYER = (PLAYER_SHOTS, PLAYER_SHOTS, HOSTILE_SHOTS, HOSTILE_SHOTS, HOSTILE_SHOTS)
+KIND_MARGIN = np.array([0, 0, 30, 50, 50], dtype=np.float64)  # How far off screen before culling
+
+
+def ring(count, speed):
+    """Velocity block for `count` bullets spread evenly around a circle"""
+    angles = np.arange(count) / count * 2 * np.pi
+    return np.cos(angles) * speed, np.sin(angles) * speed
+
+
+class ProjectileStore(ColumnPool):
+    COLUMNS = (
+        ('x', np.float64), ('y', np.float64),
+        ('dx', np.float64), ('dy', np.float64),
+        ('size', np.float64), ('damage', np.float64),
+        ('kind', np.int8),
+    )
+    INTERPOLATED = ('x', 'y')
+
+    def __init__(self, width, height, layer, capacity=1024):
+        super().__init__(capacity)
+        self.width = width
+        self.height = height
+        self.layer = layer
+
+    def acquire_kind(self, count, kind):
+        """Acquire `count` slots stamped with a kind's size and damage.
+
+        Returns (start, end); the caller writes positions and velocities in place.
+        """
+        start = self.acquire(count)
+        end = start + count
+        self.size[start:end] = KIND_SIZE[kind]
+        self.damage[start:end] = KIND_DAMAGE[kind]
+        self.kind[start:end] = kind
+        return start, end
+
+    def add_block(self, x, y, dx, dy, kind):
+        """Append a block of projectiles of one kind fired from (x, y).
+
+        x and y may be scalars or arrays; dx and dy are per-projectile velocity arrays.
+        """
+        count = len(dx)
+        if count == 0:
+            return
+        start, end = self.acquire_kind(count, kind)
+        self.x[start:end] = x
+        self.y[start:end] = y
+        self.dx[start:end] = dx
+        self.dy[start:end] = dy
+
+    def update(self):
+        """Move every projectile one tick and cull the ones that left the screen"""
+        n = self.count
+        if n == 0:
+            return
+        x = self.x[:n]
+        y = self.y[:n]
+        x += self.dx[:n]
+        y += self.dy[:n]
+        margin = KIND_MARGIN[self.kind[:n]]
+        on_screen = ((x >= -margin) & (x <= self.width + margin) &
+                     (y >= -margin) & (y <= self.height + margin))
+        self.keep(on_screen)
+
@@ -0,0 +1,83 @@
+"""Adaptive quality for the pygame frontend.
+
+When the final boss's volleys or a black-zombie swarm push frames over
+budget, the governor gives up effects one tier at a time instead of letting
+the frame rate drop:
+
+    FULL            everything
+    NO_GLOW         bosses and boss bullets without their glow/aura rings
+    NO_HEALTH_BARS  ...and no zombie health bars
+    SIMPLE_ORBS     ...and orbs without their outer ring
+    LOW_RESOLUTION  ...and the world drawn at half resolution and scaled up
+
+Each tier includes the ones before it. Decisions are made on the mean work
+time (frame time minus the frame-rate wait) over a window of frames. A tier
+is dropped as soon as the mean is over budget, but only restored once the
+mean has been well under budget for a while; a tier that has to be dropped
+again soon after being restored makes the next restore wait twice as long.
+"""
+from collections import deque
+
+FULL, NO_GLOW, NO_HEALTH_BARS, SIMPLE_ORBS, LOW_RESOLUTION = range(5)
+TIER_NAMES = ('full', 'no glow', 'no health bars', 'simple orbs', 'low resolution')
+
+
+class QualityGovernor:
+    def __init__(self, budget_ms, max_tier=LOW_RESOLUTION, window=30, degrade_at=1.0, restore_at=0.6,
+                 hold=120, max_hold=960):
+        self.budget_ms = budget_ms
+        self.max_tier = max_tier
+        self.degrade_ms = budget_ms * degrade_at
+        self.restore_ms = budget_ms * restore_at
+        self.base_hold = self.hold = hold  # Frames a tier is kept before it can be restored
+        self.max_hold = max_hold
+        self.samples = deque(maxlen=window)
+        self.tier = FULL
+        self.frames_at_tier = 0
+        self.restored = False  # The current tier was reached by restoring, not dropping
+        self.changes = 0
+
+    def update(self, work_ms):
+        """Feed one frame's work time. Returns the tier to draw the next frame at"""
+        samples = self.samples
+        samples.append(work_ms)
+        self.frames_at_tier += 1
+        if len(samples) < samples.maxlen:
+            return self.tier
+        mean_ms = sum(samples) / len(samples)
+        if mean_ms > self.degrade_ms and self.tier < self.max_tier:
+            if self.restored and self.frames_at_tier < self.hold:
+                # Restoring didn't stick; wait longer before trying again
+                self.hold = min(self.hold * 2, self.max_hold)
+            self.set_tier(self.tier + 1, restored=False)
+        elif mean_ms < self.restore_ms and self.tier > FULL and self.frames_at_tier >= self.hold:
+            self.set_tier(self.tier - 1, restored=True)
+        elif self.restored and self.frames_at_tier >= self.max_hold:
+            # Stable at a restored tier for a long time: back to the short hold
+            self.hold = self.base_hold
+        return self.tier
+
+    def set_tier(self, tier, restored=False):
+        self.tier = tier
+        self.restored = restored
+        self.frames_at_tier = 0
+        self.samples.clear()
+        self.changes += 1
+
+    @property
+    def name(self):
+        return TIER_NAMES[self.tier]
+
+
+class FixedQuality:
+    """Stands in for the governor when a tier is pinned from the command line"""
+    def __init__(self, tier):
+        self.tier = tier
+        self.changes = 0
+
+    def update(self, work_ms):
+        return self.tier
+
+    @property
+    def name(self):
+        return TIER_NAMES[self.tier]
@@ -0,0 +1,144 @@
+"""Input recording and headless replay.
+
+A game is fully determined by its seed and the InputState fed to each tick,
+so that is all an InputLog stores. Each tick packs into a flag byte plus the
+aim point, identical consecutive ticks are run-length encoded, and the whole
+log is zlib compressed; a few minutes of play is a few kilobytes.
+
+Replaying steps a fresh Simulation with the recorded seed and inputs as fast
+as the CPU allows, with no window:
+
+    python replay.py session.zsr
+"""
+import argparse
+import struct
+import time
+import zlib
+
+from zombie_engine import InputState, Simulation
+
+MAGIC = b'ZSR1'
+HEADER = struct.Struct('<4sQI')  # magic, seed, tick count
+RUN = struct.Struct('<HBhh')  # repeat count, flags, aim x, aim y
+MAX_RUN = 0xFFFF
+MAX_SEED = (1 << 64) - 1  # The header stores the seed unsigned, in 64 bits
+
+# InputState flag bits
+UP = 1 << 0
+DOWN = 1 << 1
+LEFT = 1 << 2
+RIGHT = 1 << 3
+PAUSE = 1 << 4
+CHEAT_LEVEL_15 = 1 << 5
+CHEAT_FINAL_BOSS = 1 << 6
+
+
+def pack_input(inputs):
+    """InputState -> (flags, aim_x, aim_y). The aim is rounded to whole pixels"""
+    flags = ((UP if inputs.up else 0) | (DOWN if inputs.down else 0) |
+             (LEFT if inputs.left else 0) | (RIGHT if inputs.right else 0) |
+             (PAUSE if inputs.pause else 0) |
+             (CHEAT_LEVEL_15 if inputs.cheat_level_15 else 0) |
+             (CHEAT_FINAL_BOSS if inputs.cheat_final_boss else 0))
+    aim_x, aim_y = inputs.aim
+    return flags, int(round(aim_x)), int(round(aim_y))
+
+
+def unpack_input(flags, aim_x, aim_y):
+    return InputState(
+        up=bool(flags & UP), down=bool(flags & DOWN),
+        left=bool(flags & LEFT), right=bool(flags & RIGHT),
+        aim=(aim_x, aim_y), pause=bool(flags & PAUSE),
+        cheat_level_15=bool(flags & CHEAT_LEVEL_15),
+        cheat_final_boss=bool(flags & CHEAT_FINAL_BOSS),
+    )
+
+
+class InputLog:
+    """Seed plus run-length encoded per-tick inputs for one game"""
+    def __init__(self, seed):
+        if not 0 <= seed <= MAX_SEED:
+            # Caught here, not when the log is written at the end of the session
+            raise ValueError(f"seed {seed} can't be recorded, it must be in 0..{MAX_SEED}")
+        self.seed = seed
+        self.runs = []  # [count, flags, aim_x, aim_y]
+        self.ticks = 0
+
+    def __len__(self):
+        return self.ticks
+
+    def record(self, inputs):
+        """Append the input for one tick"""
+        packed = pack_input(inputs)
+        runs = self.runs
+        if runs and runs[-1][0] < MAX_RUN and tuple(runs[-1][1:]) == packed:
+            runs[-1][0] += 1
+        else:
+            runs.append([1, *packed])
+        self.ticks += 1
+
+    def __iter__(self):
+        """Yield one InputState per recorded tick"""
+        for count, flags, aim_x, aim_y in self.runs:
+            inputs = unpack_input(flags, aim_x, aim_y)
+            for _ in range(count):
+                yield inputs
+
+    def to_bytes(self):
+        body = b''.join(RUN.pack(*run) for run in self.runs)
+        return HEADER.pack(MAGIC, self.seed, self.ticks) + zlib.compress(body, 9)
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, seed, ticks = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("not a Zombie Shooter input log")
+        log = cls(seed)
+        body = zlib.decompress(data[HEADER.size:])
+        log.runs = [list(run) for run in RUN.iter_unpack(body)]
+        log.ticks = ticks
+        return log
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
+
+
+def replay(log, max_ticks=None, on_tick=None):
+    """Re-run a recorded game headlessly. Returns the finished Simulation.
+
+    `on_tick(sim)` is called after every step, for timing or inspection.
+    """
+    sim = Simulation(seed=log.seed)
+    for tick, inputs in enumerate(log):
+        if max_ticks is not None and tick >= max_ticks:
+            break
+        over = sim.step(inputs)
+        if on_tick:
+            on_tick(sim)
+        if over:
+            break
+    return sim
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded Zombie Shooter game at full speed")
+    parser.add_argument('log', help="input log written by zombie-shooter-v1.0.py --record")
+    parser.add_argument('--ticks', type=int, default=None, help="stop after this many ticks")
+    args = parser.parse_args()
+
+    log = InputLog.load(args.log)
+    start = time.perf_counter()
+    sim = replay(log, args.ticks)
+    elapsed = time.perf_counter() - start
+    print(f"seed {log.seed}: {sim.ticks} ticks in {elapsed:.2f}s ({sim.ticks / max(elapsed, 1e-9):.0f} ticks/s)")
+    print(f"score {sim.score}, level {sim.level}, health {sim.player.health:g}, game over: {sim.game_over}")
+
+
+if __name__ == "__main__":
+    main()
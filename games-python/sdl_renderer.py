@@ -0,0 +1,111 @@
+"""SDL2 Renderer/Texture backend for the pygame frontend.
+
+RendererScreen stands in for the display Surface. It has the few Surface
+methods the frontend draws with (fill, blit, blits, get_size) and turns them
+into pygame._sdl2.video Renderer calls. Each source surface is uploaded as a
+Texture the first time it is drawn and kept for as long as the surface is
+alive, so the sprite atlas, the baked glows and every cached line of HUD
+text go to the GPU once and are drawn with texture copies from then on.
+
+The accelerated renderer is used when SDL has one; otherwise (no GPU, or
+SDL's dummy video driver on headless CI) it falls back to SDL's software
+renderer.
+
+begin_reduced()/end_reduced() bracket drawing that should happen at a
+fraction of the resolution: it goes to a smaller target texture through the
+renderer's scale, so the same draw calls touch fewer pixels, and is then
+stretched over the screen.
+"""
+import weakref
+
+import pygame
+from pygame._sdl2 import error as SDLError
+from pygame._sdl2.video import Renderer, Texture, Window
+
+
+def create_renderer(window):
+    """Hardware renderer if SDL can make one, else the software renderer. Returns (renderer, accelerated)"""
+    try:
+        return Renderer(window, accelerated=1, target_texture=True), True
+    except SDLError:
+        return Renderer(window, accelerated=0, target_texture=True), False
+
+
+class RendererScreen:
+    def __init__(self, title, size):
+        self.window = Window(title, size)
+        self.renderer, self.accelerated = create_renderer(self.window)
+        self.size = tuple(size)
+        self.textures = weakref.WeakKeyDictionary()  # Source Surface -> its Texture
+        self.reduced = None  # Target texture for begin_reduced(), made on first use
+
+    def texture(self, surface):
+        """The Texture for a surface, uploaded on first use"""
+        texture = self.textures.get(surface)
+        if texture is None:
+            texture = self.textures[surface] = Texture.from_surface(self.renderer, surface)
+        return texture
+
+    def get_size(self):
+        return self.size
+
+    def fill(self, color, rect=None):
+        renderer = self.renderer
+        renderer.draw_color = pygame.Color(color)
+        if rect is None:
+            renderer.clear()
+            return pygame.Rect((0, 0), self.size)
+        rect = pygame.Rect(rect)
+        renderer.fill_rect(rect)
+        return rect
+
+    def blit(self, source, dest, area=None):
+        if area is None:
+            area = source.get_rect()
+        else:
+            area = pygame.Rect(area)
+        # Surface.blit takes a rect as dest too, but only its position
+        rect = pygame.Rect(dest[0], dest[1], area.width, area.height)
+        self.texture(source).draw(area, rect)
+        return rect
+
+    def blits(self, blit_sequence, doreturn=True):
+        """(source, dest, area) entries, all drawn with explicit areas as the atlas batches are"""
+        rects = []
+        texture = None
+        last_source = None
+        for source, (x, y), area in blit_sequence:
+            if source is not last_source:
+                texture = self.texture(source)
+                last_source = source
+            rect = (x, y, area[2], area[3])
+            texture.draw(area, rect)
+            if doreturn:
+                rects.append(pygame.Rect(rect))
+        return rects if doreturn else None
+
+    def begin_reduced(self, divisor=2):
+        """Send drawing to a 1/divisor resolution target until end_reduced()"""
+        width, height = self.size
+        size = (width // divisor, height // divisor)
+        if self.reduced is None or (self.reduced.width, self.reduced.height) != size:
+            self.reduced = Texture(self.renderer, size, target=True)
+        renderer = self.renderer
+        renderer.target = self.reduced
+        renderer.scale = (1 / divisor, 1 / divisor)
+        renderer.draw_color = pygame.Color(0, 0, 0)
+        renderer.clear()
+
+    def end_reduced(self):
+        """Stretch what was drawn since begin_reduced() over the whole screen"""
+        renderer = self.renderer
+        renderer.target = None
+        renderer.scale = (1, 1)
+        self.reduced.draw()
+
+    def present(self):
+        self.renderer.present()
+
+    def to_surface(self):
+        """Read the frame back into a Surface (slow; for screenshots and tests)"""
+        return self.renderer.to_surface()
@@ -0,0 +1,90 @@
+"""Uniform spatial hash grid used as the collision broad phase.
+
+Entities are inserted by the bounding box of their circle into every cell it
+touches, keyed by (cell_x, cell_y). The grid is stored as a sorted array of
+cell keys, so both building it and finding every candidate pair for a batch
+of query circles are a handful of vectorized NumPy operations. Collision
+cost then grows with the number of nearby pairs, not with bullets times
+zombies.
+"""
+import numpy as np
+
+# Cell coordinates are packed into one int64 key: (cx + OFFSET) * STRIDE + (cy + OFFSET)
+_OFFSET = 1 << 20
+_STRIDE = 1 << 21
+
+
+def _cell_entries(cell_size, xs, ys, radii):
+    """Expand circles into (cell key, owner index) entries, one per covered cell.
+
+    Also returns whether any circle covers more than one cell.
+    """
+    x0 = np.floor((xs - radii) / cell_size).astype(np.int64)
+    x1 = np.floor((xs + radii) / cell_size).astype(np.int64)
+    y0 = np.floor((ys - radii) / cell_size).astype(np.int64)
+    y1 = np.floor((ys + radii) / cell_size).astype(np.int64)
+    width = x1 - x0 + 1
+    counts = width * (y1 - y0 + 1)
+    if (counts == 1).all():
+        keys = (x0 + _OFFSET) * _STRIDE + (y0 + _OFFSET)
+        return keys, np.arange(len(xs)), False
+
+    owners = np.repeat(np.arange(len(xs)), counts)
+    # Position of each entry within its owner's block of cells
+    local = np.arange(len(owners)) - np.repeat(np.cumsum(counts) - counts, counts)
+    width = width[owners]
+    cx = x0[owners] + local % width
+    cy = y0[owners] + local // width
+    keys = (cx + _OFFSET) * _STRIDE + (cy + _OFFSET)
+    return keys, owners, True
+
+
+def _expand_ranges(starts, counts):
+    """Concatenate arange(start, start + count) for every (start, count) pair"""
+    total = int(counts.sum())
+    offsets = np.repeat(np.cumsum(counts) - counts, counts)
+    return np.arange(total) - offsets + np.repeat(starts, counts)
+
+
+class SpatialHash:
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        self.keys = np.empty(0, dtype=np.int64)
+        self.owners = np.empty(0, dtype=np.int64)
+        self.multi_cell = False
+
+    def rebuild(self, xs, ys, radii):
+        """Re-insert every entity from parallel x, y and radius arrays; indices are positions"""
+        keys, owners, self.multi_cell = _cell_entries(self.cell_size, xs, ys, radii)
+        order = np.argsort(keys, kind='stable')
+        self.keys = keys[order]
+        self.owners = owners[order]
+
+    def pairs(self, xs, ys, radii):
+        """Candidate (query index, entity index) pairs for a batch of query circles.
+
+        Every entity sharing a cell with a query's bounding box is returned
+        once per query, sorted by query index then entity index. These are
+        candidates only; callers still do the exact distance test.
+        """
+        empty = np.empty(0, dtype=np.int64)
+        if len(xs) == 0 or len(self.keys) == 0:
+            return empty, empty
+        query_keys, query_owners, query_multi = _cell_entries(self.cell_size, xs, ys, radii)
+        lo = np.searchsorted(self.keys, query_keys, side='left')
+        hi = np.searchsorted(self.keys, query_keys, side='right')
+        counts = hi - lo
+        if not counts.any():
+            return empty, empty
+        queries = np.repeat(query_owners, counts)
+        entities = self.owners[_expand_ranges(lo, counts)]
+
+        if query_multi or self.multi_cell:
+            # A query and an entity that both span cells can meet in several of them
+            combined = np.unique(queries * (len(self.owners) + 1) + entities)
+            queries, entities = np.divmod(combined, len(self.owners) + 1)
+        else:
+            order = np.lexsort((entities, queries))
+            queries = queries[order]
+            entities = entities[order]
+        return queries, entities
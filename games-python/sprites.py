@@ -0,0 +1,147 @@
+"""Pre-baked sprites for the pygame frontend.
+
+Bosses and boss bullets are a solid body with translucent glow rings around
+it. Building those rings means fresh SRCALPHA surfaces for every ring of
+every entity every frame, so instead each look is baked once, body and rings
+composited into a single surface, and drawn with one blit. Sprites are keyed
+by everything that affects how they look (size, colours, ring layout), so a
+different size or colour simply bakes a new one.
+
+Everything that appears in bulk (orbs, bullets, zombie bodies, health bar
+pieces) is also packed into a SpriteAtlas: one surface holding every visual
+variant, so a whole layer of entities is a single Surface.blits call with a
+(source, position, area) entry per entity.
+"""
+import numpy as np
+import pygame
+
+
+def glow_rings(count, step, alpha, fade, width):
+    """Ring layout ((extra radius, alpha, line width), ...) growing by `step` and fading by `fade`"""
+    return tuple((i * step, alpha - i * fade, width) for i in range(count))
+
+
+def bake_glow(body_color, size, glow_color, rings):
+    """Render a body circle plus its glow rings onto one surface. Returns (surface, radius)"""
+    radius = size + max(extra for extra, _, _ in rings)
+    sprite = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+    pygame.draw.circle(sprite, body_color, (radius, radius), size)
+    for extra, alpha, width in rings:
+        # Blend each ring on exactly as it used to be blended onto the screen
+        glow_size = size + extra
+        ring = pygame.Surface((glow_size * 2, glow_size * 2), pygame.SRCALPHA)
+        pygame.draw.circle(ring, (*glow_color, alpha), (glow_size, glow_size), glow_size, width)
+        sprite.blit(ring, (radius - glow_size, radius - glow_size))
+    return sprite, radius
+
+
+def circle_sprite(color, radius, ring_color=None, ring_radius=0, ring_width=1):
+    """A filled circle, optionally with an outline ring, on a transparent square. Returns (surface, anchor)
+
+    The anchor is the centre pixel, so the sprite blits to (int(x) - anchor, int(y) - anchor).
+    """
+    anchor = max(radius, ring_radius)
+    sprite = pygame.Surface((anchor * 2 + 1, anchor * 2 + 1), pygame.SRCALPHA)
+    pygame.draw.circle(sprite, color, (anchor, anchor), radius)
+    if ring_color:
+        pygame.draw.circle(sprite, ring_color, (anchor, anchor), ring_radius, ring_width)
+    return sprite, anchor
+
+
+def rect_sprite(color, width, height):
+    sprite = pygame.Surface((width, height), pygame.SRCALPHA)
+    sprite.fill(color)
+    return sprite
+
+
+class SpriteAtlas:
+    """Many small sprites shelf-packed into one surface.
+
+    Each key maps to (area, anchor_x, anchor_y): the sprite's rect on the atlas
+    surface and the offset from its top-left corner to the point it is drawn at.
+    """
+    def __init__(self):
+        self.surface = None
+        self.entries = {}
+
+    def build(self, sprites, width=512, padding=1):
+        """Pack {key: (surface, (anchor_x, anchor_y))} into a fresh atlas surface"""
+        order = sorted(sprites, key=lambda key: sprites[key][0].get_height(), reverse=True)
+        places = {}
+        x = y = shelf = 0
+        for key in order:
+            w, h = sprites[key][0].get_size()
+            if x + w > width:
+                x = 0
+                y += shelf + padding
+                shelf = 0
+            places[key] = (x, y)
+            x += w + padding
+            shelf = max(shelf, h)
+
+        surface = pygame.Surface((width, y + shelf), pygame.SRCALPHA)
+        surface.fill((0, 0, 0, 0))
+        self.entries = {}
+        for key, (x, y) in places.items():
+            sprite, (anchor_x, anchor_y) = sprites[key]
+            # MAX onto the cleared atlas copies the pixels exactly, alpha included
+            surface.blit(sprite, (x, y), special_flags=pygame.BLEND_RGBA_MAX)
+            self.entries[key] = (pygame.Rect((x, y), sprite.get_size()), anchor_x, anchor_y)
+        if pygame.display.get_surface() is not None:
+            # Match the display's pixel format so blits don't convert on the fly
+            surface = surface.convert_alpha()
+        self.surface = surface
+
+    def batch(self, keys, xs, ys):
+        """Surface.blits entries drawing the sprite for each key at each (x, y).
+
+        xs and ys are integer pixel lists; keys is one key per entity.
+        """
+        entries = self.entries
+        source = self.surface
+        blits = []
+        append = blits.append
+        for key, x, y in zip(keys, xs, ys):
+            area, anchor_x, anchor_y = entries[key]
+            append((source, (x - anchor_x, y - anchor_y), area))
+        return blits
+
+    def extents(self, keys):
+        """(len(keys), 4) array of (left, top, width, height) of each key's sprite relative to its draw point"""
+        entries = self.entries
+        return np.array([(-anchor_x, -anchor_y, area.width, area.height)
+                         for area, anchor_x, anchor_y in (entries[key] for key in keys)])
+
+
+class SpriteCache:
+    def __init__(self):
+        self.sprites = {}
+
+    def glow(self, body_color, size, glow_color, rings):
+        """The baked (surface, radius) for this look, baked on first use"""
+        key = (body_color, size, glow_color, rings)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            sprite = self.sprites[key] = bake_glow(body_color, size, glow_color, rings)
+        return sprite
+
+    def circle(self, color, size):
+        """The (surface, anchor) for a plain filled circle, baked on first use"""
+        key = (color, size)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            sprite = self.sprites[key] = circle_sprite(color, size)
+        return sprite
+
+    def draw_circle(self, screen, x, y, color, size):
+        """Blit a plain circle centred on (x, y). Returns the Rect drawn into"""
+        sprite, anchor = self.circle(color, size)
+        return screen.blit(sprite, (int(x) - anchor, int(y) - anchor))
+
+    def draw_glow(self, screen, x, y, body_color, size, glow_color, rings):
+        """Blit the baked sprite centred on (x, y). Returns the Rect drawn into"""
+        sprite, radius = self.glow(body_color, size, glow_color, rings)
+        return screen.blit(sprite, (int(x) - radius, int(y) - radius))
+
+    def clear(self):
+        self.sprites.clear()
@@ -0,0 +1,46 @@
+"""Font registry and rendered-text cache for the pygame frontend.
+
+pygame.font.Font(None, size) looks up and loads the default font file every
+time it is called, and most HUD text is identical from one frame to the
+next. TextCache loads each size once and keeps rendered surfaces keyed by
+(text, size, colour) in an LRU, so a label is only re-rendered when the value
+in it changes.
+"""
+from collections import OrderedDict
+
+import pygame
+
+
+class TextCache:
+    def __init__(self, capacity=256, font_path=None):
+        self.capacity = capacity
+        self.font_path = font_path
+        self.fonts = {}
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def font(self, size):
+        """The shared Font for a size, loaded on first use"""
+        font = self.fonts.get(size)
+        if font is None:
+            font = self.fonts[size] = pygame.font.Font(self.font_path, size)
+        return font
+
+    def render(self, text, size, color):
+        """Antialiased surface for text, rendered only if it isn't cached"""
+        key = (text, size, color)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = self.font(size).render(text, True, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.capacity:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
@@ -0,0 +1,45 @@
+"""Fixed-timestep clock for driving the Simulation from a variable frame rate.
+
+The simulation always advances in whole ticks of TICK_MS simulated
+milliseconds. Each rendered frame feeds its real elapsed time (scaled by
+time_scale) into an accumulator, runs as many whole ticks as fit, and
+leaves the remainder as `alpha`, the fraction of a tick to interpolate
+drawing by. Slow frames run more ticks instead of slowing the game down,
+and a time scale above 1 fast-forwards it.
+"""
+
+
+def lerp(previous, current, alpha):
+    """Blend from the previous tick's value to the current one by alpha (0..1)"""
+    return previous + (current - previous) * alpha
+
+
+class FixedStep:
+    def __init__(self, step_ms, time_scale=1.0, max_steps=8):
+        self.step_ms = step_ms
+        self.time_scale = time_scale
+        # Cap on ticks per frame, so one long stall can't snowball into ever longer frames
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.dropped_ms = 0.0
+
+    def advance(self, frame_ms):
+        """Add one frame's real elapsed time. Returns how many ticks to run now"""
+        self.accumulator += frame_ms * self.time_scale
+        steps = int(self.accumulator // self.step_ms)
+        limit = self.max_steps * max(1, int(self.time_scale + 0.5))
+        if steps > limit:
+            # Too far behind to catch up: drop the backlog rather than stall
+            self.dropped_ms += (steps - limit) * self.step_ms
+            steps = limit
+            self.accumulator = steps * self.step_ms + self.accumulator % self.step_ms
+        self.accumulator -= steps * self.step_ms
+        return steps
+
+    @property
+    def alpha(self):
+        """How far between the last two ticks the current frame falls"""
+        return self.accumulator / self.step_ms
+
+    def reset(self):
+        self.accumulator = 0.0
@@ -0,0 +1,703 @@
+"""Headless simulation engine for Zombie Shooter.
+
+The engine owns the whole game state (player, bullets, zombies, bosses, orbs,
+spawning, levels and collisions) and advances it one fixed tick at a time from
+an InputState. It never touches pygame: no display, fonts or event queue, so it
+can be imported and stepped as fast as the CPU allows for tests and balance
+work. zombie-shooter-v1.0.py is a thin pygame frontend on top of it, and
+games-android/main.py a Kivy one (its build copies the engine's modules in).
+
+    sim = Simulation()
+    while not sim.step(InputState(right=True, aim=(800, 300))):
+        pass
+"""
+import random
+import math
+
+import numpy as np
+
+from spatial_hash import SpatialHash
+from orbs import OrbStore
+from horde import ZombieHorde, chase_step, NORMAL, BUFF, GREEN, BLACK, KIND_ORBS, KIND_SCORE
+from projectiles import (
+    ProjectileStore, ring, KIND_LAYER, BULLET, RED_BULLET, SMALL_BULLET, BOSS_BULLET,
+    FINAL_BOSS_BULLET,
+)
+from layers import PLAYER, PLAYER_SHOTS, ZOMBIES, BOSSES, HOSTILE_SHOTS, enabled_pairs
+from frame_timing import NULL_TIMER
+
+# Constants
+SCREEN_WIDTH = 800
+SCREEN_HEIGHT = 600
+FPS = 60
+TICK_MS = 1000 / FPS  # Simulated milliseconds per tick
+
+PLAYER_SIZE = 20  # Player radius in pixels
+CHEAT_HOLD_TIME = 2000  # Cheat keys must be held for 2 seconds
+COLLISION_CELL_SIZE = 64  # Grid cell edge in pixels, about the size of the biggest zombie
+
+# Radial burst velocities, computed once and appended as array blocks
+BLACK_ZOMBIE_RING = ring(10, 4)  # 10 bullets in circle, speed 4
+BOSS_RING = ring(20, 6)  # 20 bullets in all directions, speed 6
+FINAL_BOSS_RING = ring(30, 5)  # 30 bullets in all directions, speed 5
+STREAM_INDEX = np.arange(64, dtype=np.float64)  # 0..63, for the player's spread
+
+# Phases of step() that get lapped on sim.timer, in order
+SIM_PHASES = ('cheats', 'player', 'bullets', 'zombies', 'bosses', 'orbs', 'spawning', 'collisions')
+
+
+def circles_hit(x, y, size, entity):
+    """Narrow-phase test of circles (arrays, or a single one as scalars) against an entity with x, y and size"""
+    dx = x - entity.x
+    dy = y - entity.y
+    reach = size + entity.size
+    return dx * dx + dy * dy < reach * reach
+
+
+class InputState:
+    """Input for a single simulation tick.
+
+    Movement and cheat flags mean "held during this tick", `pause` means the
+    pause key was pressed this tick (it toggles), and `aim` is the point the
+    player auto-shoots at.
+    """
+    def __init__(self, up=False, down=False, left=False, right=False, aim=(0, 0),
+                 pause=False, cheat_level_15=False, cheat_final_boss=False):
+        self.up = up
+        self.down = down
+        self.left = left
+        self.right = right
+        self.aim = aim
+        self.pause = pause
+        self.cheat_level_15 = cheat_level_15
+        self.cheat_final_boss = cheat_final_boss
+
+
+class Player:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+        self.prev_x = x  # Position at the start of the tick, for render interpolation
+        self.prev_y = y
+        self.size = PLAYER_SIZE
+        self.speed = 5
+        self.last_shot = 0
+        self.base_shoot_delay = 200  # Base delay between shots
+        self.shoot_delay = 200  # Current delay (will be modified by level)
+        self.health = 10
+        self.max_health = 10
+        self.last_damage_time = 0
+        self.damage_cooldown = 1000  # 1 second in milliseconds
+
+    def update_shoot_speed(self, level):
+        """Update shoot speed based on level"""
+        # Each level makes you shoot faster
+        speed_multiplier = 2 ** (level - 1)  # 1x, 2x, 4x, 8x, etc.
+        self.shoot_delay = max(25, self.base_shoot_delay // speed_multiplier)  # Minimum 25ms delay
+
+    def update(self, inputs):
+        # Movement
+        if inputs.up:
+            self.y -= self.speed
+        if inputs.down:
+            self.y += self.speed
+        if inputs.left:
+            self.x -= self.speed
+        if inputs.right:
+            self.x += self.speed
+
+        # Keep player on screen
+        self.x = max(self.size, min(SCREEN_WIDTH - self.size, self.x))
+        self.y = max(self.size, min(SCREEN_HEIGHT - self.size, self.y))
+
+    def shoot(self, mouse_pos, current_time, level, projectiles):
+        """Fire this level's spread of bullets at mouse_pos into the projectile store"""
+        if current_time - self.last_shot > self.shoot_delay:
+            dx = mouse_pos[0] - self.x
+            dy = mouse_pos[1] - self.y
+            distance = math.sqrt(dx * dx + dy * dy)
+            if distance > 0:
+                # Calculate angle to mouse
+                base_angle = math.atan2(dy / distance, dx / distance)
+
+                # Level 7+ uses red bullets with 7x damage
+                if level >= 7:
+                    num_streams = level - 6  # Level 7 = 1 stream, Level 8 = 2 streams, etc.
+                    kind = RED_BULLET
+                else:
+                    # Determine number of streams for levels 1-6
+                    if level < 3:
+                        num_streams = 1
+                    else:
+                        num_streams = level
+                    kind = BULLET
+
+                # Spread bullets in an arc (up to 60 degrees)
+                spread = math.radians(60)
+                if num_streams > 1:
+                    start_angle = base_angle - spread/2
+                    angle_step = spread / (num_streams - 1)
+                else:
+                    start_angle = base_angle
+                    angle_step = 0
+                # Fill the acquired slots in place: no per-bullet objects or temporaries
+                start, end = projectiles.acquire_kind(num_streams, kind)
+                projectiles.x[start:end] = self.x
+                projectiles.y[start:end] = self.y
+                angles = projectiles.dx[start:end]
+                if num_streams <= len(STREAM_INDEX):
+                    np.multiply(STREAM_INDEX[:num_streams], angle_step, out=angles)
+                else:
+                    np.multiply(np.arange(num_streams), angle_step, out=angles)
+                angles += start_angle
+                dy = projectiles.dy[start:end]
+                np.sin(angles, out=dy)
+                dy *= 10
+                np.cos(angles, out=angles)
+                angles *= 10
+                self.last_shot = current_time
+
+    def take_damage(self, current_time):
+        if current_time - self.last_damage_time > self.damage_cooldown:
+            self.health -= 1
+            self.last_damage_time = current_time
+            return self.health <= 0  # Return True if dead
+        return False
+
+
+class Boss:
+    # Large boss
+    size = 60
+    speed = 0.8  # Slower than normal enemies
+    max_health = 25200  # 1.5x previous health (16800 * 1.5)
+    damage = 5
+    shoot_delay = 1000  # Shoots every 1 second (was 2.5 seconds)
+    damage_cooldown = 5000  # Can only damage player every 5 seconds
+    burst = BOSS_RING  # 20 bullets in all directions
+    bullet_kind = BOSS_BULLET
+    orb_drop = 150  # 150 orbs
+    score_bonus = 1000  # Huge score bonus
+
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+        self.prev_x = x  # Position at the start of the tick, for render interpolation
+        self.prev_y = y
+        self.health = self.max_health
+        self.last_shot = 0
+        self.last_damage_time = 0
+
+    def update(self, player):
+        # Move towards player
+        self.x, self.y = chase_step(self.x, self.y, self.speed, player.x, player.y)
+
+    def shoot(self, player, current_time, projectiles):
+        if current_time - self.last_shot > self.shoot_delay:
+            # Shoot a ring of bullets in all directions around the boss
+            projectiles.add_block(self.x, self.y, *self.burst, self.bullet_kind)
+            self.last_shot = current_time
+
+    def take_damage(self, damage):
+        self.health -= damage
+        return self.health <= 0
+
+    def can_damage_player(self, current_time):
+        return current_time - self.last_damage_time > self.damage_cooldown
+
+    def damage_player(self, current_time):
+        self.last_damage_time = current_time
+
+
+class FinalBoss(Boss):
+    size = 80  # Even larger than first boss
+    speed = 0.6  # Slower due to massive size
+    max_health = 50000  # 50k health
+    shoot_delay = 500  # Shoots every 0.5 seconds
+    burst = FINAL_BOSS_RING  # 30 bullets in all directions
+    bullet_kind = FINAL_BOSS_BULLET
+    orb_drop = 500  # 500 orbs
+    score_bonus = 5000  # Massive score bonus
+
+
+class CollisionHits:
+    """Everything the collision passes found in one tick, before any of it is applied"""
+    def __init__(self, player_shots, hostile_shots, zombies):
+        self.player_shots_spent = np.zeros(player_shots, dtype=bool)
+        self.hostile_shots_spent = np.zeros(hostile_shots, dtype=bool)
+        self.zombie_damage = np.zeros(zombies, dtype=np.float64)
+        self.boss_damage = 0.0
+        self.player_damage = 0.0
+        self.boss_contact = False
+        self.zombie_contact = False
+
+
+class Simulation:
+    """All game state plus the per-tick update, with no display attached.
+
+    Time is simulated: every step() advances `current_time` by TICK_MS, so
+    cooldowns and spawn timers behave the same whether the engine is driven
+    at 60 Hz by the pygame frontend or flat out by a script.
+
+    Every random draw comes from the game's own `rng`, seeded from `seed`, so
+    the same seed and the same per-tick inputs always replay the same game.
+    """
+    def __init__(self, seed=None):
+        if seed is None:
+            seed = random.randrange(1 << 32)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.timer = NULL_TIMER  # Swap in a frame_timing.PhaseTimer to time each phase
+        self.player = Player(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
+        # One projectile store per collision layer
+        self.player_bullets = ProjectileStore(SCREEN_WIDTH, SCREEN_HEIGHT, PLAYER_SHOTS)
+        self.enemy_bullets = ProjectileStore(SCREEN_WIDTH, SCREEN_HEIGHT, HOSTILE_SHOTS)
+        self.shots = {PLAYER_SHOTS: self.player_bullets, HOSTILE_SHOTS: self.enemy_bullets}
+        self.zombies = ZombieHorde()
+        self.orbs = OrbStore()
+        self.score = 0
+        self.zombie_spawn_timer = 0
+        self.zombie_spawn_delay = 2000  # 2 seconds
+        self.zombies_spawned = 0  # Track total zombies spawned for buff enemy timing
+
+        # Simulated clock
+        self.current_time = 0
+        self.ticks = 0
+        self.game_over = False
+
+        # Orb and level system
+        self.orbs_collected = 0
+        self.level = 1
+        self.orbs_needed = 10  # Start with 10 orbs needed for level 2
+
+        # Boss system
+        self.boss = None
+        self.boss_spawned = False
+        self.boss_defeated = False
+
+        # Final boss system
+        self.final_boss = None
+        self.final_boss_spawned = False
+        self.final_boss_defeated = False
+
+        # Green/black enemy system
+        self.orange_spawn_count = 0  # Track orange spawns for green enemy timing
+        self.green_spawn_count = 0  # Track green enemy spawns for black enemy timing
+
+        # Pause system
+        self.paused = False
+
+        # Collisions: grid broad phase (rebuilt every tick) and the layer
+        # passes the collision matrix enables
+        self.zombie_grid = SpatialHash(COLLISION_CELL_SIZE)
+        self.collision_passes = [getattr(self, name) for _, _, name in enabled_pairs(self.COLLISION_PASSES)]
+
+        # Cheat system
+        self.cheat_start_time = 0
+        self.cheat_active = False
+
+        # Second cheat system (T + 2 for level 25)
+        self.cheat2_start_time = 0
+        self.cheat2_active = False
+
+    def spawn_orbs(self, x, y, count):
+        """Spawn orbs at the given position"""
+        # Spread orbs around the death location
+        randint = self.rng.randint
+        offsets = [(randint(-15, 15), randint(-15, 15)) for _ in range(count)]
+        offsets = np.array(offsets, dtype=np.float64).reshape(count, 2)
+        self.orbs.add_block(x + offsets[:, 0], y + offsets[:, 1])
+
+    def check_level_up(self):
+        """Check if player should level up"""
+        if self.orbs_collected >= self.orbs_needed:
+            self.level += 1
+            self.orbs_collected = 0
+            self.orbs_needed = self.level * 10  # 10, 20, 30, 40, etc.
+            # Update player shoot speed
+            self.player.update_shoot_speed(self.level)
+            return True
+        return False
+
+    def spawn_boss(self):
+        """Spawn the boss at a random edge"""
+        side = self.rng.randint(0, 3)
+        if side == 0:  # Top
+            x = SCREEN_WIDTH // 2
+            y = -60
+        elif side == 1:  # Right
+            x = SCREEN_WIDTH + 60
+            y = SCREEN_HEIGHT // 2
+        elif side == 2:  # Bottom
+            x = SCREEN_WIDTH // 2
+            y = SCREEN_HEIGHT + 60
+        else:  # Left
+            x = -60
+            y = SCREEN_HEIGHT // 2
+
+        self.boss = Boss(x, y)
+        self.boss_spawned = True
+
+    def spawn_final_boss(self):
+        """Spawn the final boss at the center of the screen"""
+        # Clear all enemies
+        self.zombies.clear()
+        self.boss = None
+
+        # Spawn final boss at center
+        self.final_boss = FinalBoss(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
+        self.final_boss_spawned = True
+
+    def spawn_zombie(self):
+        # Don't spawn regular zombies during final boss
+        if self.final_boss:
+            return
+
+        # Don't spawn regular zombies if boss is active or if level 15+ and boss not defeated
+        if self.boss or (self.level >= 15 and not self.boss_defeated):
+            return
+
+        # Spawn zombies from edges of screen
+        side = self.rng.randint(0, 3)
+        if side == 0:  # Top
+            x = self.rng.randint(0, SCREEN_WIDTH)
+            y = -20
+        elif side == 1:  # Right
+            x = SCREEN_WIDTH + 20
+            y = self.rng.randint(0, SCREEN_HEIGHT)
+        elif side == 2:  # Bottom
+            x = self.rng.randint(0, SCREEN_WIDTH)
+            y = SCREEN_HEIGHT + 20
+        else:  # Left
+            x = -20
+            y = self.rng.randint(0, SCREEN_HEIGHT)
+
+        # After level 5, only spawn orange and green enemies
+        if self.level >= 10:
+            # Level 10+: Green enemies and black enemies
+            self.green_spawn_count += 1
+            if self.green_spawn_count % 20 == 0:
+                # Spawn black enemy every 20 green enemies
+                self.zombies.spawn(x, y, BLACK)
+            else:
+                # Spawn green enemy
+                self.zombies.spawn(x, y, GREEN)
+        elif self.level >= 5:
+            # Level 5-9: Track orange boss spawns for green enemy timing
+            self.orange_spawn_count += 1
+            if self.orange_spawn_count % 15 == 0:
+                self.zombies.spawn(x, y, GREEN)
+            else:
+                self.zombies.spawn(x, y, BUFF)
+        else:
+            # Every 5th zombie is a buff zombie
+            is_buff = (self.zombies_spawned + 1) % 5 == 0
+            self.zombies.spawn(x, y, BUFF if is_buff else NORMAL)
+        self.zombies_spawned += 1
+
+    # Collision passes as (layer, layer, method), run in this order for every
+    # pair the layer matrix enables. Passes only record hits in a CollisionHits;
+    # resolve_hits() then applies all of them at once.
+    COLLISION_PASSES = (
+        (PLAYER_SHOTS, BOSSES, 'collide_shots_with_boss'),
+        (PLAYER_SHOTS, ZOMBIES, 'collide_shots_with_zombies'),
+        (HOSTILE_SHOTS, PLAYER, 'collide_hostile_shots_with_player'),
+        (BOSSES, PLAYER, 'collide_boss_with_player'),
+        (ZOMBIES, PLAYER, 'collide_zombies_with_player'),
+    )
+
+    def check_collisions(self, current_time):
+        """Find every overlapping pair this tick, then resolve them in one pass.
+
+        Returns True on game over.
+        """
+        hits = CollisionHits(len(self.player_bullets), len(self.enemy_bullets), len(self.zombies))
+        for collide in self.collision_passes:
+            collide(hits)
+        return self.resolve_hits(hits, current_time)
+
+    def shots_for(self, kind):
+        """The projectile store a bullet kind belongs in, by its collision layer"""
+        return self.shots[KIND_LAYER[kind]]
+
+    def active_boss(self):
+        return self.final_boss if self.final_boss else self.boss
+
+    def defeat_boss(self, boss):
+        """Drop the boss's orbs and score bonus and mark it defeated"""
+        self.spawn_orbs(boss.x, boss.y, boss.orb_drop)
+        self.score += boss.score_bonus
+        if boss is self.final_boss:
+            self.final_boss = None
+            self.final_boss_defeated = True
+        else:
+            self.boss = None
+            self.boss_defeated = True
+
+    def collide_shots_with_boss(self, hits):
+        boss = self.active_boss()
+        shots = self.player_bullets
+        n = len(shots)
+        if not boss or n == 0:
+            return
+        # Every player shot touching the boss hits it this tick
+        touching = circles_hit(shots.x[:n], shots.y[:n], shots.size[:n], boss)
+        hits.boss_damage += float(shots.damage[:n][touching].sum())
+        hits.player_shots_spent |= touching
+
+    def collide_shots_with_zombies(self, hits):
+        shots = self.player_bullets
+        zombies = self.zombies
+        n = len(shots)
+        m = len(zombies)
+        if n == 0 or m == 0:
+            return
+        # Shots already spent on the boss don't reach zombies
+        live = np.flatnonzero(~hits.player_shots_spent)
+        if len(live) == 0:
+            return
+        zx = zombies.x[:m]
+        zy = zombies.y[:m]
+        zsize = zombies.size[:m]
+        sx = shots.x[live]
+        sy = shots.y[live]
+        ssize = shots.size[live]
+
+        # Broad phase: candidate (shot, zombie) pairs that share a grid cell
+        self.zombie_grid.rebuild(zx, zy, zsize)
+        shot_idx, zombie_idx = self.zombie_grid.pairs(sx, sy, ssize)
+        if len(shot_idx) == 0:
+            return
+
+        # Narrow phase on every candidate pair at once
+        dx = sx[shot_idx] - zx[zombie_idx]
+        dy = sy[shot_idx] - zy[zombie_idx]
+        reach = ssize[shot_idx] + zsize[zombie_idx]
+        overlap = dx * dx + dy * dy < reach * reach
+        shot_idx = shot_idx[overlap]
+        zombie_idx = zombie_idx[overlap]
+        if len(shot_idx) == 0:
+            return
+
+        # A shot is used up by the first zombie it touches (pairs are sorted by shot then zombie)
+        shot_idx, first = np.unique(shot_idx, return_index=True)
+        zombie_idx = zombie_idx[first]
+        shot_idx = live[shot_idx]
+        hits.player_shots_spent[shot_idx] = True
+        hits.zombie_damage += np.bincount(zombie_idx, weights=shots.damage[shot_idx], minlength=m)
+
+    def collide_hostile_shots_with_player(self, hits):
+        shots = self.enemy_bullets
+        n = len(shots)
+        if n == 0:
+            return
+        # Every enemy bullet touching the player lands this tick
+        touching = circles_hit(shots.x[:n], shots.y[:n], shots.size[:n], self.player)
+        hits.player_damage += float(shots.damage[:n][touching].sum())
+        hits.hostile_shots_spent |= touching
+
+    def collide_boss_with_player(self, hits):
+        boss = self.active_boss()
+        player = self.player
+        if boss and circles_hit(player.x, player.y, player.size, boss):
+            hits.boss_contact = True
+
+    def zombies_touch_player(self):
+        zombies = self.zombies
+        m = len(zombies)
+        return bool(m) and bool(circles_hit(zombies.x[:m], zombies.y[:m], zombies.size[:m], self.player).any())
+
+    def collide_zombies_with_player(self, hits):
+        if self.zombies_touch_player():
+            hits.zombie_contact = True
+
+    def resolve_hits(self, hits, current_time):
+        """Apply every hit found this tick: damage, deaths, orbs, score and removals"""
+        player = self.player
+
+        # Remove every spent bullet in one compaction per store
+        if hits.player_shots_spent.any():
+            self.player_bullets.keep(~hits.player_shots_spent)
+        if hits.hostile_shots_spent.any():
+            self.enemy_bullets.keep(~hits.hostile_shots_spent)
+
+        # Boss damage from all of this tick's shots
+        boss = self.active_boss()
+        if boss and hits.boss_damage and boss.take_damage(hits.boss_damage):
+            self.defeat_boss(boss)
+            boss = None  # A boss killed this tick doesn't touch the player
+
+        # Zombie damage, deaths, orb drops and score
+        zombies = self.zombies
+        m = len(zombies)
+        if m and hits.zombie_damage.any():
+            health = zombies.health[:m]
+            was_alive = health > 0
+            health -= hits.zombie_damage
+            died = np.flatnonzero(was_alive & (health <= 0))
+            if len(died):
+                kinds = zombies.kind[died].tolist()
+                for x, y, kind in zip(zombies.x[died].tolist(), zombies.y[died].tolist(), kinds):
+                    # Zombie died - spawn orbs and give points
+                    self.spawn_orbs(x, y, KIND_ORBS[kind])
+                    self.score += KIND_SCORE[kind]
+                zombies.keep(health > 0)
+                # Contact was found before these kills; only the survivors can still touch the player
+                hits.zombie_contact = hits.zombie_contact and self.zombies_touch_player()
+
+        # Damage to the player
+        if hits.player_damage:
+            # Enemy bullets hit player!
+            player.health -= hits.player_damage
+        if hits.boss_contact and boss and boss.can_damage_player(current_time):
+            player.health -= boss.damage
+            boss.damage_player(current_time)
+        if hits.zombie_contact:
+            player.take_damage(current_time)
+        return player.health <= 0
+
+    def update_cheats(self, inputs, current_time):
+        """Hold T + 1 for 2 seconds to skip to level 15, T + 2 for the final boss"""
+        if inputs.cheat_level_15:
+            if not self.cheat_active:
+                self.cheat_start_time = current_time
+                self.cheat_active = True
+            elif current_time - self.cheat_start_time >= CHEAT_HOLD_TIME:
+                # Skip to level 15
+                self.level = 15
+                self.orbs_collected = 0
+                self.orbs_needed = 150
+                self.player.update_shoot_speed(self.level)
+                self.cheat_active = False
+        else:
+            self.cheat_active = False
+
+        if inputs.cheat_final_boss:
+            if not self.cheat2_active:
+                self.cheat2_start_time = current_time
+                self.cheat2_active = True
+            elif current_time - self.cheat2_start_time >= CHEAT_HOLD_TIME:
+                # Skip to level 25 (final boss)
+                self.level = 25
+                self.orbs_collected = 0
+                self.orbs_needed = 250
+                self.player.update_shoot_speed(self.level)
+                # Clear all enemies and bosses
+                self.zombies.clear()
+                self.boss = None
+                self.boss_spawned = True
+                self.boss_defeated = True
+                # Reset final boss flags to allow spawning
+                self.final_boss_spawned = False
+                self.final_boss_defeated = False
+                self.cheat2_active = False
+        else:
+            self.cheat2_active = False
+
+    def step(self, inputs):
+        """Advance the simulation by one tick. Returns True once the game is over"""
+        if self.game_over:
+            return True
+
+        # Start of the tick is the "previous" state the renderer interpolates from
+        self.save_previous()
+
+        if inputs.pause:
+            self.paused = not self.paused
+        if self.paused:
+            return False
+
+        self.current_time += TICK_MS
+        self.ticks += 1
+        current_time = self.current_time
+
+        timer = self.timer
+
+        self.update_cheats(inputs, current_time)
+        timer.lap('cheats')
+
+        # Update game objects
+        self.player.update(inputs)
+
+        # Auto-shoot towards the aim point
+        self.player.shoot(inputs.aim, current_time, self.level, self.shots[PLAYER_SHOTS])
+        timer.lap('player')
+
+        # Update bullets
+        for shots in self.shots.values():
+            shots.update()
+        timer.lap('bullets')
+
+        # Move the whole horde towards the player, then black zombies shoot
+        self.zombies.update(self.player.x, self.player.y)
+        self.zombies.shoot(current_time, self.shots_for(SMALL_BULLET), BLACK_ZOMBIE_RING, SMALL_BULLET)
+        timer.lap('zombies')
+
+        # Check if boss should spawn
+        if self.level >= 15 and self.level < 25 and not self.boss_spawned and not self.boss_defeated:
+            self.spawn_boss()
+
+        # Check if final boss should spawn
+        if self.level >= 25 and not self.final_boss_spawned and not self.final_boss_defeated:
+            self.spawn_final_boss()
+
+        # Update boss
+        if self.boss:
+            self.boss.update(self.player)
+            # Boss shooting
+            self.boss.shoot(self.player, current_time, self.shots_for(self.boss.bullet_kind))
+
+        # Update final boss
+        if self.final_boss:
+            self.final_boss.update(self.player)
+            # Final boss shooting
+            self.final_boss.shoot(self.player, current_time, self.shots_for(self.final_boss.bullet_kind))
+        timer.lap('bosses')
+
+        # Update orbs: magnet, collection and compaction in one pass
+        self.orbs_collected += self.orbs.update(self.player.x, self.player.y)
+
+        # Check for level up
+        self.check_level_up()
+        timer.lap('orbs')
+
+        # Spawn zombies
+        if current_time - self.zombie_spawn_timer > self.zombie_spawn_delay:
+            self.spawn_zombie()
+            self.zombie_spawn_timer = current_time
+            # Gradually increase spawn rate
+            self.zombie_spawn_delay = max(500, self.zombie_spawn_delay - 50)
+        timer.lap('spawning')
+
+        # Check collisions
+        if self.check_collisions(current_time):
+            self.game_over = True
+        timer.lap('collisions')
+
+        return self.game_over
+
+    def save_previous(self):
+        """Copy every moving thing's position into its prev_ slot"""
+        for body in (self.player, self.boss, self.final_boss):
+            if body:
+                body.prev_x = body.x
+                body.prev_y = body.y
+        for pool in (self.player_bullets, self.enemy_bullets, self.zombies, self.orbs):
+            pool.save_previous()
+
+    def entity_counts(self):
+        """Live entities per store"""
+        return {
+            'zombies': len(self.zombies),
+            'player_bullets': len(self.player_bullets),
+            'enemy_bullets': len(self.enemy_bullets),
+            'orbs': len(self.orbs),
+        }
+
+    def pool_stats(self):
+        """Usage and high-water marks of every entity pool"""
+        return {
+            'player_bullets': self.player_bullets.stats(),
+            'enemy_bullets': self.enemy_bullets.stats(),
+            'zombies': self.zombies.stats(),
+            'orbs': self.orbs.stats(),
+        }